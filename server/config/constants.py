@@ -24,8 +24,8 @@ DB_POOL_RECYCLE_DEFAULT = 3600  # 1 hour
 DB_HEALTHCHECK_TIMEOUT_DEFAULT = 2.0
 
 # Statement cache sizes by environment
-DB_STMT_CACHE_SIZE_PRODUCTION = 1000
-DB_STMT_CACHE_SIZE_DEVELOPMENT = 500
+DB_STMT_CACHE_SIZE_PRODUCTION = 2048
+DB_STMT_CACHE_SIZE_DEVELOPMENT = 1024
 
 # ============================================================================
 # LOGGING CONSTANTS
@@ -18,10 +18,13 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from scripts.runtime.logger import logger as _app_logger
+from scripts.runtime.logger import get_log_queue_stats
 logger = _app_logger.getChild("main")
 from scripts.runtime.database import create_db_and_tables_async as init_database
 from scripts.runtime.database import engine as db_engine
 from scripts.runtime.database import check_db_connectivity
+from scripts.runtime.database import start_room_cache_listener
+from scripts.runtime.database import stop_health_refresh
 from scripts.runtime.websocket_server import start_websocket_server, get_websocket_factory
 from scripts.runtime.paths import get_database_dir
 from scripts.runtime.auth_middleware import get_current_user
@@ -43,6 +46,8 @@ async def startup_event():
     logger.info("Starting up the application...")
     await init_database()
     logger.info("Database initialized.")
+    # Cross-process room cache invalidation (no-op outside PostgreSQL)
+    await start_room_cache_listener()
     # Log database connection details
     try:
         db_url = db_engine.url.render_as_string(hide_password=True)
@@ -67,7 +72,7 @@ async def startup_event():
         timeout = float(os.getenv("DB_HEALTHCHECK_TIMEOUT", "2.0"))
         fail_on_error = os.getenv("FAIL_ON_DB_STARTUP_ERROR", "false").lower() in ("1", "true", "yes")
         if do_check:
-            ok, detail, dur_ms = await check_db_connectivity(timeout_seconds=timeout)
+            ok, detail, dur_ms = await check_db_connectivity(timeout_seconds=timeout, max_age_seconds=0)
             if ok:
                 logger.info(
                     "Database startup healthcheck passed",
@@ -142,6 +147,11 @@ async def startup_event():
             }
         )
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks started at runtime."""
+    await stop_health_refresh()
+
 # ============================================================================
 # Middleware
 # ============================================================================
@@ -225,3 +235,11 @@ async def health_db(timeout: float = 1.5):
     }
     return JSONResponse(payload, status_code=status_code)
 
+@app.get("/health/logging")
+def health_logging():
+    """Async logging queue health endpoint.
+
+    Returns:
+        dict: Queue depth, capacity and count of records dropped when full
+    """
+    return get_log_queue_stats()
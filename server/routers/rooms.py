@@ -17,8 +17,9 @@ from scripts.runtime.paths import get_songs_pdf_dir, get_songs_img_dir
 from scripts.runtime.database import (
     Room, RoomParticipant, User, Song, get_db_session,
     get_room_by_id_from_db, get_song_by_id_from_db,
-    create_room_db, delete_room, add_participant, remove_participant,
-    generate_room_id, get_room, log_room_action
+    create_room_db, delete_room_by_id, add_participant, remove_participant,
+    notify_room_updated, invalidate_room, get_room_for_write,
+    generate_room_id, log_room_action
 )
 from scripts.runtime.auth_middleware import get_current_user, get_room_access, get_host_access
 from scripts.runtime.websocket_server import get_websocket_factory
@@ -178,11 +179,11 @@ async def _cleanup_existing_host_rooms(session: AsyncSession, host_id: str):
                 if ws_factory:
                     try:
                         ws_factory.register_room(old_room.room_id)
-                        asyncio.create_task(ws_factory.broadcast_to_room(old_room.room_id, {
+                        ws_factory.broadcast_to_room(old_room.room_id, {
                             "type": "room_closed",
                             "room_id": old_room.room_id,
                             "reason": "Host created new room"
-                        }))
+                        })
                     except Exception:
                         logger.warning(
                             "Failed to notify room closure",
@@ -194,7 +195,7 @@ async def _cleanup_existing_host_rooms(session: AsyncSession, host_id: str):
                         )
                 
                 # Delete the room (this also deletes participants via cascade)
-                await delete_room(session, old_room)
+                await delete_room_by_id(session, old_room.room_id)
             
             cleanup_elapsed = (time.perf_counter() - cleanup_start) * 1000
             logger.info(
@@ -322,10 +323,10 @@ async def join_room(
         if ws_factory:
             try:
                 ws_factory.register_room(room_id)
-                asyncio.create_task(ws_factory.broadcast_to_room(room_id, {
+                ws_factory.broadcast_to_room(room_id, {
                     "type": "participant_joined",
                     "user_id": user_id
-                }))
+                })
                 logger.info(
                     "Participant joined notification sent",
                     extra={
@@ -420,10 +421,9 @@ async def leave_room(room_id: str, room_and_user = Depends(get_room_access), ses
 
         if is_host or len(remaining_participants) == 0:
             logger.info(f"Host {user_id} left or room is empty. Closing room {room_id}.")
-            current_room = await get_room(session, room_id)
-            if current_room:
-                await delete_room(session, current_room)  # helper no longer commits
+            await delete_room_by_id(session, room_id)  # helper does not commit
             await session.commit()
+            invalidate_room(room_id)
 
             # Notify room closure via WebSocket
             if ws_factory:
@@ -431,10 +431,10 @@ async def leave_room(room_id: str, room_and_user = Depends(get_room_access), ses
                     ws_factory.register_room(room_id)
                 except Exception:
                     logger.warning("WS register_room failed in leave_room(room_closed)", exc_info=True, extra={"room_id": room_id})
-                asyncio.create_task(ws_factory.broadcast_to_room(room_id, {
+                ws_factory.broadcast_to_room(room_id, {
                     "type": "room_closed",
                     "room_id": room_id
-                }))
+                })
                 logger.info(f"Queued room_closed event for room {room_id} via WebSocket")
             else:
                 logger.warning(f"WebSocket factory not available, could not send room_closed event")
@@ -449,10 +449,10 @@ async def leave_room(room_id: str, room_and_user = Depends(get_room_access), ses
                     ws_factory.register_room(room_id)
                 except Exception:
                     logger.warning("WS register_room failed in leave_room(participant_left)", exc_info=True, extra={"room_id": room_id})
-                asyncio.create_task(ws_factory.broadcast_to_room(room_id, {
+                ws_factory.broadcast_to_room(room_id, {
                     "type": "participant_left",
                     "user_id": user_id
-                }))
+                })
                 logger.info(f"Queued participant_left event for user {user_id} in room {room_id} via WebSocket")
             else:
                 logger.warning(f"WebSocket factory not available, could not send participant_left event")
@@ -521,18 +521,19 @@ async def select_song_for_room(
         if not os.path.exists(pdf_path):
             raise HTTPException(status_code=404, detail="Song PDF not found. The song may not have been properly preloaded.")
 
-        # Update room state - fetch room in current session without eager loading
-        result = await session.execute(select(Room).where(Room.room_id == room_id))
-        current_room = result.scalars().first()
+        # Update room state from a fresh read, not the cached snapshot
+        current_room = await get_room_for_write(session, room_id)
         if not current_room:
             raise HTTPException(status_code=404, detail="Room not found")
             
         current_room.current_song = song.id
         current_room.current_page = 1
         session.add(current_room)
+        await notify_room_updated(session, room_id)
         
         # Batch commit with room creation if needed
         await session.commit()
+        invalidate_room(room_id)
         # Remove expensive refresh - data already available
 
         # 5. Compute image ETag for page 1 (metadata only) using weak ETag (size-mtime)
@@ -602,8 +603,9 @@ async def update_room_page(room_id: str, request: UpdatePageRequest, host_data =
             })
         
         # Load and update the room in the current session to persist page change
-        result = await session.execute(select(Room).where(Room.room_id == room_id))
-        current_room = result.scalars().first()
+        current_room = await get_room_for_write(session, room_id)
+        if not current_room:
+            raise HTTPException(status_code=404, detail="Room not found")
 
         # Check page bounds against current song
         if current_room.current_song:
@@ -620,9 +622,11 @@ async def update_room_page(room_id: str, request: UpdatePageRequest, host_data =
 
         # Log the action in the same transaction
         await log_room_action(session, room_id, "page_updated", host_id, {"page": page})
+        await notify_room_updated(session, room_id)
 
         # Commit state change and log entry
         await session.commit()
+        invalidate_room(room_id)
 
         # Get song details and compute image ETag (metadata only) based on updated state
         song_details = None
@@ -6,15 +6,22 @@ Simplified to a single env-configured async engine with one session factory.
 from typing import Optional, List, AsyncGenerator, Tuple
 from datetime import datetime
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import select, delete, text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select, delete, text, bindparam, tuple_, func, Column, DateTime, Index
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.orm.util import identity_key
 
 import os
 import time
+import logging
 import asyncio
 import uuid
+import base64
+import functools
+from cachetools import TTLCache
 from scripts.runtime.logger import logger as _app_logger
 logger = _app_logger.getChild("db")
 
@@ -74,6 +81,18 @@ def _parse_int(val: str, default: int) -> int:
 # ============================================================================
 # Database Models
 # ============================================================================
+def _server_ts(onupdate: bool = False):
+    """Timestamp column filled by the database's now() instead of Python."""
+    return Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True),
+            server_default=func.now(),
+            onupdate=func.now() if onupdate else None,
+            nullable=False,
+        ),
+    )
+
 class User(SQLModel, table=True):
     """User model for Firebase-authenticated users.
     
@@ -86,7 +105,7 @@ class User(SQLModel, table=True):
     firebase_uid: str = Field(unique=True, index=True)
     display_name: Optional[str] = None
     email: str = Field(unique=True, index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = _server_ts()
     last_login: Optional[datetime] = None
 
 class Song(SQLModel, table=True):
@@ -105,7 +124,7 @@ class Song(SQLModel, table=True):
     key: Optional[str] = None
     tempo: Optional[str] = None
     language: Optional[str] = Field(default="English")
-    date_added: datetime = Field(default_factory=datetime.utcnow)
+    date_added: Optional[datetime] = _server_ts()
     filename: Optional[str] = None
     page_count: int
 
@@ -120,11 +139,14 @@ class Room(SQLModel, table=True):
     for better performance during real-time updates.
     """
     __tablename__ = "room"
+    # Serves lookups by host (the leading column) and per-host recency order;
+    # room_id needs no extra index beyond its primary key
+    __table_args__ = (Index("ix_room_host_updated", "host_id", "updated_at"),)
     
-    room_id: str = Field(primary_key=True, index=True)
-    host_id: str = Field(index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    room_id: str = Field(primary_key=True)
+    host_id: str
+    created_at: Optional[datetime] = _server_ts()
+    updated_at: Optional[datetime] = _server_ts(onupdate=True)
     
     # Song fields - no foreign key constraint for performance
     current_song: Optional[str] = None
@@ -141,9 +163,10 @@ class RoomParticipant(SQLModel, table=True):
     """
     __tablename__ = "roomparticipant"
     
-    room_id: str = Field(foreign_key="room.room_id", primary_key=True, index=True)
+    # room_id leads the composite primary key, which already indexes it
+    room_id: str = Field(foreign_key="room.room_id", primary_key=True)
     user_id: str = Field(primary_key=True, index=True)
-    joined_at: datetime = Field(default_factory=datetime.utcnow)
+    joined_at: Optional[datetime] = _server_ts()
     
     room: Room = Relationship(back_populates="participants")
 
@@ -157,8 +180,8 @@ class Playlist(SQLModel, table=True):
     name: str
     description: Optional[str] = None
     user_id: str = Field(index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = _server_ts()
+    updated_at: Optional[datetime] = _server_ts(onupdate=True)
     songs: List["PlaylistSong"] = Relationship(back_populates="playlist")
 
 class PlaylistSong(SQLModel, table=True):
@@ -169,61 +192,221 @@ class PlaylistSong(SQLModel, table=True):
     """
     playlist_id: str = Field(foreign_key="playlist.id", primary_key=True)
     song_id: str = Field(foreign_key="songs.id", primary_key=True)
-    added_at: datetime = Field(default_factory=datetime.utcnow)
+    added_at: Optional[datetime] = _server_ts()
     position: int = Field(default=0)
     playlist: Playlist = Relationship(back_populates="songs")
     song: Song = Relationship(back_populates="playlist_songs")
 
+# ============================================================================
+# Pre-built Statements
+# ============================================================================
+# Hot-path statements are built once at import time with named bind parameters
+# so SQLAlchemy's compiled cache and asyncpg's prepared statement cache both
+# see the same statement object on every call. Primary-key lookups go through
+# session.get() instead so identity-map hits skip SQL entirely.
+# ON CONFLICT (room_id, user_id) is backed by roomparticipant's composite
+# primary key, so no extra unique index is needed.
+_INS_PARTICIPANT = (
+    pg_insert(RoomParticipant.__table__)
+    .values(room_id=bindparam("room_id"), user_id=bindparam("user_id"))
+    .on_conflict_do_nothing(index_elements=["room_id", "user_id"])
+)
+# Core table deletes: no ORM session synchronization is needed for these rows
+_DEL_PARTICIPANT = RoomParticipant.__table__.delete().where(
+    RoomParticipant.__table__.c.room_id == bindparam("room_id"),
+    RoomParticipant.__table__.c.user_id == bindparam("user_id"),
+)
+_DEL_PARTICIPANTS_IN = RoomParticipant.__table__.delete().where(
+    RoomParticipant.__table__.c.room_id == bindparam("room_id"),
+    RoomParticipant.__table__.c.user_id.in_(bindparam("user_ids", expanding=True)),
+)
+_DEL_ROOM_PARTICIPANTS = RoomParticipant.__table__.delete().where(
+    RoomParticipant.__table__.c.room_id == bindparam("room_id")
+)
+_DEL_ROOM = Room.__table__.delete().where(Room.__table__.c.room_id == bindparam("room_id"))
+_SEL_SONGS_BY_IDS = select(Song).where(Song.id.in_(bindparam("ids", expanding=True)))
+_SEL_SONGS_ILIKE = (
+    select(*Song.__table__.columns)
+    .where(Song.title.ilike(bindparam("pattern")) | Song.artist.ilike(bindparam("pattern")))
+    .order_by(Song.title)
+    .limit(bindparam("limit"))
+)
+
 # ============================================================================
 # Database Engine Configuration
 # ============================================================================
 IS_PROD = _parse_bool(os.getenv("PROD", "0"), default=False)
 
-# Defaults differ for dev vs prod; env can override
+# Defaults differ for dev vs prod; env can override.
+# Every worker process has its own pool, so the server sees
+# workers * (pool_size + max_overflow) connections; 8 + 4 keeps four workers
+# well inside PostgreSQL's default max_connections of 100.
 default_pool_size = 8 if IS_PROD else 5
 default_max_overflow = 4 if IS_PROD else 5
 default_timeout = 30
 default_recycle = 1800
 default_pre_ping = True if IS_PROD else False
-default_use_lifo = True
-default_stmt_cache = 1000 if IS_PROD else 500
+default_use_lifo = "auto"
+default_stmt_cache = 2048 if IS_PROD else 1024
+default_query_cache = 1200
 
 POOL_SIZE = _parse_int(os.getenv("DB_POOL_SIZE"), default_pool_size)
 MAX_OVERFLOW = _parse_int(os.getenv("DB_MAX_OVERFLOW"), default_max_overflow)
 POOL_TIMEOUT = _parse_int(os.getenv("DB_POOL_TIMEOUT"), default_timeout)
 POOL_RECYCLE = _parse_int(os.getenv("DB_POOL_RECYCLE"), default_recycle)
 POOL_PRE_PING = _parse_bool(os.getenv("DB_PRE_PING"), default_pre_ping)
-POOL_USE_LIFO = _parse_bool(os.getenv("DB_POOL_USE_LIFO"), default_use_lifo)
+LIFO_SETTING = (os.getenv("DB_POOL_USE_LIFO") or default_use_lifo).strip().lower()
 STMT_CACHE_SIZE = _parse_int(os.getenv("DB_STMT_CACHE_SIZE"), default_stmt_cache)
+# SQLAlchemy's engine-wide LRU of compiled statements (SA default is 500)
+QUERY_CACHE_SIZE = _parse_int(os.getenv("DB_QUERY_CACHE_SIZE"), default_query_cache)
+# PostgreSQL JIT only pays off for long analytical queries; for short OLTP
+# lookups its compile step is pure latency
+DB_JIT = _parse_bool(os.getenv("DB_JIT"), False)
+# Optional cap on concurrently executing statements (0 = unlimited); queues
+# callers in-process instead of letting them pile up on pool checkout timeouts
+MAX_CONCURRENT_QUERIES = _parse_int(os.getenv("DB_MAX_CONCURRENT_QUERIES"), 0)
+
+def _detect_pgbouncer(url: str) -> bool:
+    """Guess whether DATABASE_URL points at PgBouncer.
+
+    True when PGBOUNCER=1 is set, the URL mentions "pgbouncer", or the port is
+    PgBouncer's default 6432.
+    """
+    if _parse_bool(os.getenv("PGBOUNCER"), False) or "pgbouncer" in url.lower():
+        return True
+    try:
+        return make_url(url).port == 6432
+    except Exception:
+        return False
+
+# PgBouncer in front of PostgreSQL: LIFO checkout keeps the hot connections
+# busy so idle ones age out on the pooler. Direct PostgreSQL gets FIFO in
+# "auto" mode so every pooled connection stays warm.
+PGBOUNCER = _detect_pgbouncer(os.getenv("DATABASE_URL", ""))
+if PGBOUNCER:
+    if LIFO_SETTING != "auto" and not _parse_bool(LIFO_SETTING):
+        logger.info("PgBouncer detected; forcing pool_use_lifo=True", extra={"operation": "db_pool_config"})
+    POOL_USE_LIFO = True
+elif LIFO_SETTING == "auto":
+    POOL_USE_LIFO = False
+else:
+    POOL_USE_LIFO = _parse_bool(LIFO_SETTING)
+
+# In transaction pooling mode consecutive statements may land on different
+# server connections, so prepared statements cannot be reused; both asyncpg's
+# cache and SQLAlchemy's prepared statement cache are disabled to avoid
+# "prepared statement does not exist" errors. A detected PgBouncer is assumed
+# to be in transaction mode unless PGBOUNCER_MODE=session says otherwise.
+PGBOUNCER_MODE = os.getenv("PGBOUNCER_MODE", "").strip().lower()
+PGBOUNCER_TXN_MODE = PGBOUNCER_MODE == "transaction" or (PGBOUNCER and PGBOUNCER_MODE != "session")
+if PGBOUNCER_TXN_MODE and STMT_CACHE_SIZE:
+    logger.warning(
+        "PgBouncer transaction pooling assumed; disabling prepared statement caches",
+        extra={"operation": "db_pool_config", "stmt_cache_size": STMT_CACHE_SIZE},
+    )
+    STMT_CACHE_SIZE = 0
+
+# Pool class is pinned so saturation always waits on the async path.
+# DB_POOL_CLASS=null disables client-side pooling, which is the default under
+# PgBouncer transaction mode where the server-side pooler already multiplexes.
+POOL_CLASS = os.getenv("DB_POOL_CLASS", "null" if PGBOUNCER_TXN_MODE else "queue").strip().lower()
+if POOL_CLASS not in ("null", "queue"):
+    logger.warning(f"Unknown DB_POOL_CLASS={POOL_CLASS!r}; using queue", extra={"operation": "db_pool_config"})
+    POOL_CLASS = "queue"
 
 engine_kwargs = {
     "echo": bool(int(os.getenv("DB_ECHO", "0"))),
-    "pool_size": POOL_SIZE,
-    "max_overflow": MAX_OVERFLOW,
-    "pool_timeout": POOL_TIMEOUT,
-    "pool_recycle": POOL_RECYCLE,
     "pool_pre_ping": POOL_PRE_PING,
-    "pool_use_lifo": POOL_USE_LIFO,
-    # asyncpg prepared statement cache per connection
-    "connect_args": {"statement_cache_size": STMT_CACHE_SIZE},
+    "query_cache_size": QUERY_CACHE_SIZE,
+    # asyncpg prepared statement cache per connection (0 under PgBouncer transaction mode)
+    "connect_args": {
+        "statement_cache_size": STMT_CACHE_SIZE,
+        "prepared_statement_cache_size": STMT_CACHE_SIZE,
+    },
 }
+if not DB_JIT and not PGBOUNCER:
+    # PgBouncer rejects unknown startup parameters unless configured to ignore them
+    engine_kwargs["connect_args"]["server_settings"] = {"jit": "off"}
+if PGBOUNCER_TXN_MODE:
+    # Unique names so unnamed statements never collide across server connections
+    engine_kwargs["connect_args"]["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+if POOL_CLASS == "null":
+    engine_kwargs["poolclass"] = NullPool
+else:
+    engine_kwargs.update({
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_use_lifo": POOL_USE_LIFO,
+    })
 
 # Log effective pool configuration on startup
 logger.info(
     "Database pool configuration loaded",
     extra={
         "operation": "db_pool_config",
+        "pool_class": POOL_CLASS,
         "pool_size": POOL_SIZE,
         "max_overflow": MAX_OVERFLOW,
         "pool_timeout": POOL_TIMEOUT,
         "pool_recycle": POOL_RECYCLE,
         "pre_ping": POOL_PRE_PING,
         "use_lifo": POOL_USE_LIFO,
+        "use_lifo_setting": LIFO_SETTING,
+        "pgbouncer": PGBOUNCER,
+        "pgbouncer_txn_mode": PGBOUNCER_TXN_MODE,
         "stmt_cache_size": STMT_CACHE_SIZE,
+        "query_cache_size": QUERY_CACHE_SIZE,
+        "jit": DB_JIT,
+        "max_concurrent_queries": MAX_CONCURRENT_QUERIES,
         "is_prod": IS_PROD,
     },
 )
 
+# Advisory: all workers' pools together must fit under the server's
+# max_connections, keeping a few slots for superuser/maintenance sessions
+_worker_count = _parse_int(os.getenv("WEB_CONCURRENCY"), 1)
+_server_max_connections = _parse_int(os.getenv("DB_SERVER_MAX_CONNECTIONS"), 100)
+if POOL_CLASS == "queue" and _worker_count * (POOL_SIZE + MAX_OVERFLOW) > _server_max_connections - 10:
+    logger.warning(
+        "Database pools may exceed the server's max_connections",
+        extra={
+            "operation": "db_pool_config",
+            "pool_capacity": POOL_SIZE + MAX_OVERFLOW,
+            "workers": _worker_count,
+            "server_max_connections": _server_max_connections,
+        },
+    )
+
+_query_semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES) if MAX_CONCURRENT_QUERIES > 0 else None
+
+def _bounded(method):
+    """Run an AsyncSession method while holding a DB_MAX_CONCURRENT_QUERIES slot."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if _query_semaphore is None:
+            return await method(self, *args, **kwargs)
+        async with _query_semaphore:
+            return await method(self, *args, **kwargs)
+    return wrapper
+
+class BoundedAsyncSession(AsyncSession):
+    """AsyncSession whose statement-issuing calls honour DB_MAX_CONCURRENT_QUERIES.
+
+    scalars() and stream_scalars() go through execute() and stream(), so they
+    are bounded without being wrapped again. A stream()'s later row fetches
+    and flush/commit are not bounded.
+    """
+
+    execute = _bounded(AsyncSession.execute)
+    scalar = _bounded(AsyncSession.scalar)
+    get = _bounded(AsyncSession.get)
+    get_one = _bounded(AsyncSession.get_one)
+    stream = _bounded(AsyncSession.stream)
+    refresh = _bounded(AsyncSession.refresh)
+
 # Global engine and session factory (initialized lazily)
 engine = None
 AsyncSessionLocal = None
@@ -241,12 +424,11 @@ def get_engine():
     if engine is None:
         DATABASE_URL = get_database_url()
         engine = create_async_engine(DATABASE_URL, **engine_kwargs)
-        AsyncSessionLocal = sessionmaker(
-            bind=engine, 
-            class_=AsyncSession, 
-            expire_on_commit=False, 
-            autoflush=False, 
-            autocommit=False
+        AsyncSessionLocal = async_sessionmaker(
+            bind=engine,
+            class_=BoundedAsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
         )
     return engine
 
@@ -254,7 +436,7 @@ def get_session_factory():
     """Get the session factory, ensuring engine is initialized.
     
     Returns:
-        sessionmaker: Configured async session factory
+        async_sessionmaker: Configured async session factory
     """
     get_engine()
     return AsyncSessionLocal
@@ -273,6 +455,71 @@ async def create_db_and_tables_async():
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
         await conn.commit()
+    if engine.dialect.name == "postgresql":
+        await _ensure_schema_upgrades(engine)
+        await _ensure_search_schema(engine)
+
+# create_all never alters existing tables or their indexes. Columns created
+# while timestamps were filled in Python have no DEFAULT (inserts now omit them
+# and rely on it), and room tables still carry single-column indexes that the
+# primary keys and ix_room_host_updated already cover.
+_SCHEMA_UPGRADE_DDL = tuple(
+    f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT now()"
+    for table, column in (
+        ("users", "created_at"),
+        ("songs", "date_added"),
+        ("room", "created_at"),
+        ("room", "updated_at"),
+        ("roomparticipant", "joined_at"),
+        ("playlist", "created_at"),
+        ("playlist", "updated_at"),
+        ("playlistsong", "added_at"),
+    )
+) + (
+    "CREATE INDEX IF NOT EXISTS ix_room_host_updated ON room (host_id, updated_at)",
+    "DROP INDEX IF EXISTS ix_room_room_id",
+    "DROP INDEX IF EXISTS ix_room_host_id",
+    "DROP INDEX IF EXISTS ix_roomparticipant_room_id",
+)
+
+async def _ensure_schema_upgrades(engine) -> None:
+    """Bring tables created by older versions up to the current model.
+
+    Each statement runs in its own transaction, so one failure (e.g. a table
+    an older deployment never created) does not roll back the others.
+    """
+    for ddl in _SCHEMA_UPGRADE_DDL:
+        try:
+            async with engine.begin() as conn:
+                await conn.exec_driver_sql(ddl)
+        except Exception as e:
+            logger.warning(
+                "Schema upgrade statement skipped",
+                extra={"operation": "db_init", "statement": ddl, "error": str(e)},
+            )
+
+# Trigram GIN indexes serve both similarity (%) and ILIKE '%q%' predicates.
+# The stored `ts` column keeps search_songs_text a GIN probe instead of a
+# per-row to_tsvector(); it is added with ALTER TABLE because create_all never
+# adds columns to an existing table. Names match populate_db's
+# setup_search_infrastructure so neither duplicates the other.
+_SEARCH_SCHEMA_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_songs_title_trgm ON songs USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_songs_artist_trgm ON songs USING gin (artist gin_trgm_ops)",
+    "ALTER TABLE songs ADD COLUMN IF NOT EXISTS ts tsvector GENERATED ALWAYS AS "
+    "(to_tsvector('simple', coalesce(title,'') || ' ' || coalesce(artist,''))) STORED",
+    "CREATE INDEX IF NOT EXISTS idx_songs_ts_gin ON songs USING gin (ts)",
+)
+
+async def _ensure_search_schema(engine) -> None:
+    """Best-effort search setup; search falls back to plain scans without it."""
+    try:
+        async with engine.begin() as conn:
+            for ddl in _SEARCH_SCHEMA_DDL:
+                await conn.exec_driver_sql(ddl)
+    except Exception as e:
+        logger.warning("Search index setup skipped", extra={"operation": "db_init", "error": str(e)})
 
 # ============================================================================
 # Session Management
@@ -281,18 +528,14 @@ async def create_db_and_tables_async():
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency for database session management.
     
-    Yields a single async session with automatic cleanup.
-    Ensures proper session lifecycle management.
+    Yields a single async session; the context manager closes it on exit.
     
     Yields:
         AsyncSession: Database session for request handling
     """
     get_engine()
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
 
 
 # ============================================================================
@@ -315,6 +558,131 @@ def normalize_song_id(song_id: str) -> str:
             pass
     return song_id
 
+# Song lookup coalescing: concurrent lookups arriving within a short window are
+# answered by a single IN query instead of one SELECT per caller. Opt-in: the
+# batch runs on its own pooled session, so a request already holding a
+# connection needs a second one, every lookup waits out the window, and rows
+# the caller has not committed yet are invisible to it.
+SONG_LOADER_ENABLED = _parse_bool(os.getenv("DB_SONG_LOADER"), False)
+SONG_LOADER_WINDOW_MS = _parse_int(os.getenv("DB_SONG_LOADER_WINDOW_MS"), 2)
+SONG_LOADER_MAX_BATCH = _parse_int(os.getenv("DB_SONG_LOADER_MAX_BATCH"), 200)
+
+class SongLoader:
+    """DataLoader-style batcher for song primary-key lookups.
+
+    Callers awaiting `load()` inside the same window share one round-trip on a
+    dedicated session. Returned songs are detached from that session with all
+    columns loaded, which is all the read-only callers need.
+    """
+
+    def __init__(self, window_ms: int = 2, max_batch: int = 200):
+        self.window_s = max(0, window_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.pending: dict = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def load(self, song_id: str) -> Optional[Song]:
+        """Queue a lookup for `song_id` and wait for the batch to resolve it."""
+        return (await self.load_many([song_id]))[0]
+
+    async def load_many(self, song_ids: List[str]) -> List[Optional[Song]]:
+        """Queue several IDs in the same batch; results follow `song_ids` order."""
+        futs = []
+        for song_id in song_ids:
+            fut = self.pending.get(song_id)
+            if fut is None:
+                fut = asyncio.get_running_loop().create_future()
+                self.pending[song_id] = fut
+            futs.append(fut)
+        if self._task is None:
+            self._task = asyncio.create_task(self._dispatch())
+        # All futures resolve in the same batch, so awaiting them in turn costs
+        # nothing extra. Shield so a cancelled caller does not cancel a future
+        # other callers share.
+        return [await asyncio.shield(fut) for fut in futs]
+
+    async def _dispatch(self):
+        try:
+            await asyncio.sleep(self.window_s)
+        finally:
+            self._task = None
+        while self.pending:
+            keys = list(self.pending)[: self.max_batch]
+            batch = {k: self.pending.pop(k) for k in keys}
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch: dict):
+        log_debug = logger.isEnabledFor(logging.DEBUG)
+        start_time = time.perf_counter() if log_debug else 0.0
+        try:
+            async with get_session_factory()() as session:
+                result = await session.execute(_SEL_SONGS_BY_IDS, {"ids": list(batch)})
+                found = {s.id: s for s in result.scalars().all()}
+        except Exception as e:
+            for fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for key, fut in batch.items():
+            if not fut.done():
+                fut.set_result(found.get(key))
+        if log_debug:
+            elapsed = (time.perf_counter() - start_time) * 1000
+            logger.debug(
+                "Song batch lookup completed",
+                extra={
+                    "operation": "song_loader_batch",
+                    "batch_size": len(batch),
+                    "found": len(found),
+                    "duration_ms": round(elapsed, 1),
+                },
+            )
+
+song_loader = SongLoader(SONG_LOADER_WINDOW_MS, SONG_LOADER_MAX_BATCH)
+
+# Read-through cache for song lookups. Song rows only change when the catalog
+# is re-ingested, so column snapshots are kept per process under every ID
+# spelling that resolved to them; hits return a detached Song like SongLoader
+# does. Misses are not cached so newly ingested songs appear immediately.
+SONG_CACHE_TTL = _parse_int(os.getenv("DB_SONG_CACHE_TTL"), 300)
+SONG_CACHE_MAXSIZE = _parse_int(os.getenv("DB_SONG_CACHE_MAXSIZE"), 2048)
+_song_cache: TTLCache = TTLCache(maxsize=max(1, SONG_CACHE_MAXSIZE), ttl=max(1, SONG_CACHE_TTL))
+
+def invalidate_song_cache() -> None:
+    """Drop all cached song rows (call after inserting/updating songs)."""
+    _song_cache.clear()
+
+def _song_id_candidates(song_id: str) -> List[str]:
+    """Return lookup IDs in preference order: normalized, original, 4-digit padded (legacy)."""
+    candidates = [normalize_song_id(song_id), song_id]
+    if isinstance(song_id, str) and song_id.isdigit():
+        candidates.append(f"{int(song_id):04d}")
+    return list(dict.fromkeys(candidates))
+
+async def _load_song(session: AsyncSession, song_id: str) -> Optional[Song]:
+    """Resolve a song from the database and fill the song cache on a hit."""
+    # All accepted ID spellings are resolved in one round-trip; the earliest
+    # candidate in preference order wins
+    candidates = _song_id_candidates(song_id)
+    if SONG_LOADER_ENABLED:
+        # Concurrent callers share one batched query
+        found = await song_loader.load_many(candidates)
+        song = next((s for s in found if s is not None), None)
+    elif len(candidates) == 1:
+        song = await session.get(Song, candidates[0])
+    else:
+        result = await session.execute(_SEL_SONGS_BY_IDS, {"ids": candidates})
+        by_id = {s.id: s for s in result.scalars()}
+        song = next((by_id[c] for c in candidates if c in by_id), None)
+
+    if song is not None and SONG_CACHE_TTL > 0:
+        data = {c.key: getattr(song, c.key) for c in Song.__table__.columns}
+        # Only spellings known to resolve to this row: another candidate may
+        # map to a different (or no) song when looked up on its own
+        _song_cache[song_id] = data
+        _song_cache[song.id] = data
+    return song
+
 async def get_song_by_id_from_db(session: AsyncSession, song_id: str) -> Optional[Song]:
     """Get song by ID with smart fallback for different ID formats.
     
@@ -328,46 +696,115 @@ async def get_song_by_id_from_db(session: AsyncSession, song_id: str) -> Optiona
     Returns:
         Optional[Song]: Song object if found, None otherwise
     """
-    start_time = time.perf_counter()
-    
-    # Normalize the input ID first
-    normalized_id = normalize_song_id(song_id)
+    # Only pay for timing and the extras dict when INFO is actually emitted
+    log_info = logger.isEnabledFor(logging.INFO)
+    start_time = time.perf_counter() if log_info else 0.0
     
-    # Try normalized ID first
-    result = await session.execute(select(Song).where(Song.id == normalized_id))
-    song = result.scalars().first()
-    
-    # If not found and input was different from normalized, try original
-    if not song and normalized_id != song_id:
-        result = await session.execute(select(Song).where(Song.id == song_id))
-        song = result.scalars().first()
-    
-    # Fallback: try common padding formats for numeric IDs
-    if not song and isinstance(song_id, str) and song_id.isdigit():
-        try:
-            numeric_val = int(song_id)
-            # Try 4-digit padded format (legacy)
-            padded4 = f"{numeric_val:04d}"
-            if padded4 != song_id and padded4 != normalized_id:
-                result = await session.execute(select(Song).where(Song.id == padded4))
-                song = result.scalars().first()
-        except Exception:
-            # If any conversion error occurs, ignore and proceed with song as None
-            pass
+    data = _song_cache.get(song_id) if SONG_CACHE_TTL > 0 else None
+    if data is not None:
+        song = Song(**data)
+        make_transient_to_detached(song)
+    else:
+        song = await _load_song(session, song_id)
 
-    elapsed = (time.perf_counter() - start_time) * 1000
-    logger.info(
-        "Song lookup completed",
-        extra={
-            "operation": "get_song_by_id",
-            "song_id": song_id,
-            "found": song is not None,
-            "duration_ms": round(elapsed, 1),
-            "page_count": getattr(song, 'page_count', None)
-        }
-    )
+    if log_info:
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            "Song lookup completed",
+            extra={
+                "operation": "get_song_by_id",
+                "song_id": song_id,
+                "found": song is not None,
+                "duration_ms": round(elapsed, 1),
+                "page_count": getattr(song, 'page_count', None)
+            }
+        )
     return song
 
+# ============================================================================
+# Room Cache
+# ============================================================================
+# Room rows are read on every room/websocket request but written rarely.
+# Column snapshots are cached per process; each hit is merged into the
+# caller's session (no SQL) so callers still get a normal persistent Room.
+# Writers call notify_room_updated() inside their transaction; the NOTIFY
+# fans the invalidation out to every process LISTENing on the channel. The
+# TTL is a safety net for missed notifications. Without a running listener
+# (SQLite, PgBouncer transaction mode, listener failure) other workers'
+# writes would go unseen, so the cache is bypassed. Write paths re-read the
+# row with get_room_for_write() instead of trusting a cached snapshot.
+ROOM_CACHE_TTL = _parse_int(os.getenv("DB_ROOM_CACHE_TTL"), 5)
+ROOM_CACHE_MAXSIZE = _parse_int(os.getenv("DB_ROOM_CACHE_MAXSIZE"), 4096)
+ROOM_NOTIFY_CHANNEL = "room_updates"
+_room_cache: TTLCache = TTLCache(maxsize=max(1, ROOM_CACHE_MAXSIZE), ttl=max(1, ROOM_CACHE_TTL))
+_room_listener_conn = None
+_NOTIFY_ROOM = text(f"SELECT pg_notify('{ROOM_NOTIFY_CHANNEL}', :rid)")
+
+def invalidate_room(room_id: str) -> None:
+    """Drop a room from this process's cache."""
+    _room_cache.pop(room_id, None)
+
+async def notify_room_updated(session: AsyncSession, room_id: str) -> None:
+    """Invalidate a room locally and queue a NOTIFY sent when the caller commits."""
+    invalidate_room(room_id)
+    if _is_postgres(session):
+        await session.execute(_NOTIFY_ROOM, {"rid": room_id})
+
+def _on_room_notify(connection, pid, channel, payload):
+    invalidate_room(payload)
+
+async def start_room_cache_listener() -> bool:
+    """LISTEN for room invalidations on a dedicated asyncpg connection.
+
+    Only runs on PostgreSQL and not behind PgBouncer transaction pooling
+    (LISTEN needs a session-bound server connection). Returns True if started.
+    """
+    global _room_listener_conn
+    if ROOM_CACHE_TTL <= 0 or PGBOUNCER_TXN_MODE or _room_listener_conn is not None:
+        return False
+    eng = get_engine()
+    if eng.dialect.name != "postgresql":
+        return False
+    try:
+        import asyncpg
+        dsn = eng.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        conn = await asyncpg.connect(dsn)
+        await conn.add_listener(ROOM_NOTIFY_CHANNEL, _on_room_notify)
+        _room_listener_conn = conn
+        logger.info("Room cache listener started", extra={"operation": "room_cache_listen", "channel": ROOM_NOTIFY_CHANNEL})
+        return True
+    except Exception as e:
+        logger.warning("Room cache listener unavailable; relying on TTL", extra={"operation": "room_cache_listen", "error": str(e)})
+        return False
+
+async def _get_room_cached(session: AsyncSession, room_id: str) -> Optional[Room]:
+    """Resolve a room via the session identity map, the process cache, then SQL."""
+    if ROOM_CACHE_TTL <= 0 or _room_listener_conn is None:
+        return await session.get(Room, room_id)
+    # Never overwrite an instance the session already holds (it may be dirty)
+    room = session.identity_map.get(identity_key(Room, room_id))
+    if room is not None:
+        return room
+    data = _room_cache.get(room_id)
+    if data is not None:
+        snapshot = Room(**data)
+        make_transient_to_detached(snapshot)
+        return await session.merge(snapshot, load=False)
+    room = await session.get(Room, room_id)
+    if room is not None:
+        data = {c.key: getattr(room, c.key) for c in Room.__table__.columns}
+        _room_cache[room_id] = data
+    return room
+
+async def get_room_for_write(session: AsyncSession, room_id: str) -> Optional[Room]:
+    """Load a room from SQL before modifying it.
+
+    Replaces any cached snapshot already merged into the session, so a room
+    deleted or changed by another worker is seen as such (None for a
+    deleted room) instead of failing the flush with StaleDataError.
+    """
+    return await session.get(Room, room_id, populate_existing=True)
+
 async def get_room_by_id_from_db(session: AsyncSession, room_id: str) -> Optional[Room]:
     """Get room by ID with performance logging.
     
@@ -378,49 +815,167 @@ async def get_room_by_id_from_db(session: AsyncSession, room_id: str) -> Optiona
     Returns:
         Optional[Room]: Room object if found, None otherwise
     """
-    start_time = time.perf_counter()
-    result = await session.execute(select(Room).where(Room.room_id == room_id))
-    room = result.scalars().first()
-    elapsed = (time.perf_counter() - start_time) * 1000
-    logger.info(
-        "Room lookup completed",
-        extra={
-            "operation": "get_room_by_id",
-            "room_id": room_id,
-            "found": room is not None,
-            "duration_ms": round(elapsed, 1)
-        }
-    )
+    log_info = logger.isEnabledFor(logging.INFO)
+    start_time = time.perf_counter() if log_info else 0.0
+    room = await _get_room_cached(session, room_id)
+    if log_info:
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            "Room lookup completed",
+            extra={
+                "operation": "get_room_by_id",
+                "room_id": room_id,
+                "found": room is not None,
+                "duration_ms": round(elapsed, 1)
+            }
+        )
     return room
 
 # ============================================================================
 # Search Functions
 # ============================================================================
-async def search_songs(session: AsyncSession, query: str, limit: int = 50) -> List[Song]:
-    """Search songs by title or artist using case-insensitive matching (ILIKE).
+# In-process TTL cache shared by the search functions. Keys are
+# (function name, lowercased query, call args); values are the materialized
+# result lists. Concurrent misses for the same key wait on a per-key lock so
+# only one query reaches PostgreSQL.
+SEARCH_CACHE_TTL = _parse_int(os.getenv("DB_SEARCH_CACHE_TTL"), 60)
+SEARCH_CACHE_MAXSIZE = _parse_int(os.getenv("DB_SEARCH_CACHE_MAXSIZE"), 2048)
+_search_cache: TTLCache = TTLCache(maxsize=max(1, SEARCH_CACHE_MAXSIZE), ttl=max(1, SEARCH_CACHE_TTL))
+_search_locks: dict = {}
+
+def invalidate_search_cache() -> None:
+    """Drop all cached search results (call after inserting/updating songs)."""
+    _search_cache.clear()
+
+def _cached_search(fn):
+    """Decorator adding TTL caching and single-flight to a search function."""
+    if SEARCH_CACHE_TTL <= 0:
+        return fn
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(session: AsyncSession, query: str, *args, **kwargs):
+        key = (name, (query or "").strip().lower(), args, tuple(sorted(kwargs.items())))
+        cached = _search_cache.get(key)
+        if cached is not None:
+            return cached
+        lock = _search_locks.get(key)
+        if lock is None:
+            lock = _search_locks[key] = asyncio.Lock()
+        try:
+            async with lock:
+                cached = _search_cache.get(key)
+                if cached is not None:
+                    return cached
+                result = await fn(session, query, *args, **kwargs)
+                _search_cache[key] = result
+                return result
+        finally:
+            if not lock.locked():
+                _search_locks.pop(key, None)
+
+    return wrapper
 
-    This is the fast, DB-native baseline. It avoids Python-side fuzzy matching.
-    For better ranking on large datasets, add pg_trgm indexes and switch to
-    similarity-based ordering in a future step.
+# pg_trgm availability, probed on the first search (None = not yet known)
+_TRGM_AVAILABLE: Optional[bool] = None
+
+_SEARCH_SONGS_TRGM = text("""
+SELECT id, title, artist, genre, key, tempo, language, date_added, filename, page_count
+FROM songs
+WHERE title % :query OR COALESCE(artist, '') % :query
+   OR title ILIKE :pattern OR artist ILIKE :pattern
+ORDER BY GREATEST(
+             similarity(title, :query),
+             similarity(COALESCE(artist, ''), :query)
+         ) DESC, title
+LIMIT :limit
+""")
+
+def _is_postgres(session: AsyncSession) -> bool:
+    """Return True when the session is bound to a PostgreSQL engine."""
+    bind = session.bind
+    return bind is not None and bind.dialect.name == "postgresql"
+
+# Result sets larger than this are streamed server-side in chunks of this size
+SEARCH_STREAM_THRESHOLD = 100
+
+async def _fetch_mappings(session: AsyncSession, stmt, params: Optional[dict] = None, limit: int = 0) -> List[dict]:
+    """Execute `stmt` and return its rows as dicts.
+
+    Large limits use a server-side cursor with yield_per so rows are decoded
+    as they arrive instead of buffering the whole result first.
     """
+    if limit > SEARCH_STREAM_THRESHOLD:
+        stmt = stmt.execution_options(yield_per=SEARCH_STREAM_THRESHOLD)
+        result = await session.stream(stmt, params)
+        return [dict(r) async for r in result.mappings()]
+    result = await session.execute(stmt, params)
+    return [dict(r) for r in result.mappings()]
+
+@_cached_search
+async def search_songs(session: AsyncSession, query: str, limit: int = 50) -> List[dict]:
+    """Search songs by title or artist, ranked by trigram similarity.
+
+    On PostgreSQL with pg_trgm the match and ordering run against the GIN
+    trigram indexes on `title`/`artist`; substring matches are kept so results
+    are a superset of the plain ILIKE search. Without pg_trgm this falls back
+    to case-insensitive matching (ILIKE) ordered by title.
+
+    Rows are returned as plain dicts keyed by column name (same shape as a
+    serialized Song) to skip ORM hydration on the search path.
+    """
+    global _TRGM_AVAILABLE
     q = (query or "").strip()
     if not q:
         return []
     pattern = f"%{q}%"
-    stmt = (
-        select(Song)
-        .where((Song.title.ilike(pattern)) | (Song.artist.ilike(pattern)))
-        .order_by(Song.title)
-        .limit(limit)
-    )
-    result = await session.execute(stmt)
-    return result.scalars().all()
+
+    if _TRGM_AVAILABLE is not False and _is_postgres(session):
+        params = {"query": q, "pattern": pattern, "limit": limit}
+        try:
+            if _TRGM_AVAILABLE is None:
+                # First probe runs in a savepoint so a missing extension
+                # does not abort the caller's transaction
+                async with session.begin_nested():
+                    rows = await _fetch_mappings(session, _SEARCH_SONGS_TRGM, params, limit)
+            else:
+                rows = await _fetch_mappings(session, _SEARCH_SONGS_TRGM, params, limit)
+            _TRGM_AVAILABLE = True
+            return rows
+        except Exception as e:
+            if _TRGM_AVAILABLE:
+                raise
+            _TRGM_AVAILABLE = False
+            logger.warning(f"pg_trgm unavailable, using ILIKE search: {e}")
+
+    return await _fetch_mappings(session, _SEL_SONGS_ILIKE, {"pattern": pattern, "limit": limit}, limit)
 
 
+_SEARCH_SUBSTRING = text("""
+SELECT id AS song_id, title, artist, page_count, 'substring' AS score_type,
+       GREATEST(
+           CASE WHEN lower(title) = :q THEN 100
+                WHEN lower(title) LIKE :qpfx THEN 85
+                WHEN lower(title) LIKE :qsub THEN 70
+                ELSE 0 END,
+           CASE WHEN lower(artist) = :q THEN 100
+                WHEN lower(artist) LIKE :qpfx THEN 85
+                WHEN lower(artist) LIKE :qsub THEN 70
+                ELSE 0 END
+       ) AS score
+FROM songs
+WHERE title ILIKE :qsub OR artist ILIKE :qsub
+ORDER BY score DESC, title
+LIMIT :limit
+""")
+
+@_cached_search
 async def search_songs_substring(session: AsyncSession, query: str, limit: int = 10) -> List[dict]:
     """Substring search on `title` and `artist` with simple tiered scoring.
 
-    Scoring (max of title/artist match):
+    Matching uses ILIKE so the pg_trgm GIN indexes apply. Scoring (max of
+    title/artist match) is computed in SQL so the database can order and
+    limit before rows reach Python:
     - exact = 100
     - prefix = 85
     - contains = 70
@@ -429,62 +984,34 @@ async def search_songs_substring(session: AsyncSession, query: str, limit: int =
     q = (query or "").strip()
     if not q:
         return []
-    pattern = f"%{q}%"
-    stmt = (
-        select(Song)
-        .where((Song.title.ilike(pattern)) | (Song.artist.ilike(pattern)))
-        .limit(max(5 * limit, limit))
-    )
-    result = await session.execute(stmt)
-    songs = result.scalars().all()
-
     q_lower = q.lower()
-    def score_field(val: Optional[str]) -> int:
-        if not val:
-            return 0
-        s = val.lower()
-        if s == q_lower:
-            return 100
-        if s.startswith(q_lower):
-            return 85
-        if q_lower in s:
-            return 70
-        return 0
+    # Rows come back already shaped as the response dicts
+    return await _fetch_mappings(
+        session,
+        _SEARCH_SUBSTRING,
+        {"q": q_lower, "qpfx": f"{q_lower}%", "qsub": f"%{q_lower}%", "limit": limit},
+        limit,
+    )
 
-    items = []
-    for s in songs:
-        sc = max(score_field(s.title), score_field(s.artist))
-        if sc <= 0:
-            continue
-        items.append({
-            "song_id": s.id,
-            "title": s.title,
-            "artist": s.artist,
-            "page_count": s.page_count,
-            "score": sc,
-            "score_type": "substring",
-        })
-    # Order by score desc then title asc for stability
-    items.sort(key=lambda x: (-x["score"], (x["title"] or "")))
-    return items[:limit]
 
+_SEARCH_SIMILARITY = text("""
+SELECT id, title, artist, page_count,
+       GREATEST(
+           similarity(title, :query),
+           similarity(COALESCE(artist, ''), :query)
+       ) as score
+FROM songs
+WHERE title % :query OR COALESCE(artist, '') % :query
+ORDER BY score DESC
+LIMIT :limit
+""")
 
+@_cached_search
 async def search_songs_similarity(session: AsyncSession, query: str, limit: int = 10) -> List[dict]:
     """Similarity search using pg_trgm extension."""
     try:
         # Try pg_trgm similarity search first
-        sql = """
-        SELECT id, title, artist, page_count,
-               GREATEST(
-                   similarity(title, :query),
-                   similarity(COALESCE(artist, ''), :query)
-               ) as score
-        FROM songs 
-        WHERE title % :query OR COALESCE(artist, '') % :query
-        ORDER BY score DESC
-        LIMIT :limit
-        """
-        result = await session.execute(text(sql), {"query": query, "limit": limit})
+        result = await session.execute(_SEARCH_SIMILARITY, {"query": query, "limit": limit})
         rows = result.fetchall()
         
         if rows:
@@ -506,29 +1033,31 @@ async def search_songs_similarity(session: AsyncSession, query: str, limit: int
     songs = await search_songs(session, query, limit)
     return [
         {
-            "song_id": song.id,
-            "title": song.title,
-            "artist": song.artist,
-            "page_count": song.page_count,
+            "song_id": song["id"],
+            "title": song["title"],
+            "artist": song["artist"],
+            "page_count": song["page_count"],
             "score": 80.0,
             "score_type": "similarity_fallback",
         }
         for song in songs
     ]
 
+_SEARCH_TEXT = text("""
+SELECT id, title, artist, page_count,
+       ts_rank(ts, plainto_tsquery('simple', :query)) as score
+FROM songs
+WHERE ts @@ plainto_tsquery('simple', :query)
+ORDER BY score DESC
+LIMIT :limit
+""")
+
+@_cached_search
 async def search_songs_text(session: AsyncSession, query: str, limit: int = 10) -> List[dict]:
     """Full-text search using tsvector column."""
     try:
         # Try tsvector full-text search first
-        sql = """
-        SELECT id, title, artist, page_count,
-               ts_rank(ts, plainto_tsquery('simple', :query)) as score
-        FROM songs 
-        WHERE ts @@ plainto_tsquery('simple', :query)
-        ORDER BY score DESC
-        LIMIT :limit
-        """
-        result = await session.execute(text(sql), {"query": query, "limit": limit})
+        result = await session.execute(_SEARCH_TEXT, {"query": query, "limit": limit})
         rows = result.fetchall()
         
         if rows:
@@ -550,10 +1079,10 @@ async def search_songs_text(session: AsyncSession, query: str, limit: int = 10)
     songs = await search_songs(session, query, limit)
     return [
         {
-            "song_id": song.id,
-            "title": song.title,
-            "artist": song.artist,
-            "page_count": song.page_count,
+            "song_id": song["id"],
+            "title": song["title"],
+            "artist": song["artist"],
+            "page_count": song["page_count"],
             "score": 75.0,
             "score_type": "text_fallback",
         }
@@ -564,89 +1093,327 @@ async def search_songs_text(session: AsyncSession, query: str, limit: int = 10)
 # Helper functions from database_helpers.py
 async def create_room_db(session: AsyncSession, room_id: str, host_id: str):
     """Create a new room in the database - caller handles commit"""
-    start_time = time.perf_counter()
+    log_info = logger.isEnabledFor(logging.INFO)
+    start_time = time.perf_counter() if log_info else 0.0
     room = Room(
         room_id=room_id,
         host_id=host_id
     )
     session.add(room)
     # Don't commit here - let caller batch operations
-    elapsed = (time.perf_counter() - start_time) * 1000
-    logger.info("create_room_db", extra={"duration_ms": round(elapsed, 1)})
+    if log_info:
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logger.info("create_room_db", extra={"duration_ms": round(elapsed, 1)})
     return room
 
+# Participants and the room row are removed in one round-trip on PostgreSQL
+_DELETE_ROOM_CTE = text(
+    "WITH d1 AS (DELETE FROM roomparticipant WHERE room_id = :rid RETURNING 1) "
+    "DELETE FROM room WHERE room_id = :rid"
+)
+
+async def delete_room_by_id(session: AsyncSession, room_id: str):
+    """Delete a room and its participants by ID - caller handles commit.
+
+    No prior SELECT of the room is needed; deleting a missing room is a no-op.
+    """
+    log_info = logger.isEnabledFor(logging.INFO)
+    start_time = time.perf_counter() if log_info else 0.0
+    if _is_postgres(session):
+        await session.execute(_DELETE_ROOM_CTE, {"rid": room_id})
+    else:
+        # Writable CTEs are PostgreSQL-only; two statements elsewhere
+        await session.execute(_DEL_ROOM_PARTICIPANTS, {"room_id": room_id})
+        await session.execute(_DEL_ROOM, {"room_id": room_id})
+    # Core deletes bypass the unit of work; drop any loaded copy so a later
+    # flush cannot try to UPDATE the row that no longer exists
+    loaded = session.identity_map.get(identity_key(Room, room_id))
+    if loaded is not None:
+        session.expunge(loaded)
+    await notify_room_updated(session, room_id)
+    if log_info:
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logger.info("delete_room", extra={"duration_ms": round(elapsed, 1), "room_id": room_id})
+
 async def delete_room(session: AsyncSession, room: Room):
-    """Delete a room and its participants - caller handles commit"""
-    start_time = time.perf_counter()
-    # Delete participants in bulk
-    await session.execute(
-        delete(RoomParticipant).where(RoomParticipant.room_id == room.room_id)
-    )
-    
-    # Delete the room (no commit here)
-    await session.delete(room)
-    elapsed = (time.perf_counter() - start_time) * 1000
-    logger.info("delete_room", extra={"duration_ms": round(elapsed, 1)})
+    """Delete a room and its participants - caller handles commit.
+
+    Deprecated: prefer delete_room_by_id, which does not need a loaded Room.
+    """
+    await delete_room_by_id(session, room.room_id)
+
+# Participant write coalescing. When enabled, single add/remove calls are
+# queued and flushed together (one INSERT and one DELETE per window) on a
+# dedicated session that commits on its own, so the write is durable once the
+# call returns but is no longer part of the caller's transaction. Off by default.
+PARTICIPANT_COALESCE = _parse_bool(os.getenv("DB_PARTICIPANT_COALESCE"), False)
+PARTICIPANT_COALESCE_WINDOW_MS = _parse_int(os.getenv("DB_PARTICIPANT_COALESCE_WINDOW_MS"), 5)
+
+_participant_queue: Optional[asyncio.Queue] = None
+_participant_task: Optional[asyncio.Task] = None
+
+def submit_participant_op(op: str, room_id: str, user_id: str) -> asyncio.Future:
+    """Queue an "add" or "remove" for the coalescer; the future resolves on flush."""
+    global _participant_queue, _participant_task
+    if _participant_task is None or _participant_task.done():
+        _participant_queue = asyncio.Queue()
+        _participant_task = asyncio.create_task(_participant_flush_loop(_participant_queue))
+    fut = asyncio.get_running_loop().create_future()
+    _participant_queue.put_nowait((op, room_id, user_id, fut))
+    return fut
+
+async def _participant_flush_loop(queue: asyncio.Queue):
+    window_s = max(0, PARTICIPANT_COALESCE_WINDOW_MS) / 1000.0
+    while True:
+        batch = [await queue.get()]
+        await asyncio.sleep(window_s)
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        await _flush_participant_ops(batch)
+
+async def _flush_participant_ops(batch: list):
+    adds = list(dict.fromkeys((r, u) for op, r, u, _ in batch if op == "add"))
+    removes = list(dict.fromkeys((r, u) for op, r, u, _ in batch if op == "remove"))
+    log_debug = logger.isEnabledFor(logging.DEBUG)
+    start_time = time.perf_counter() if log_debug else 0.0
+    try:
+        async with get_session_factory()() as session:
+            if adds:
+                # executemany over the pre-built INSERT; no per-flush statement build
+                await session.execute(
+                    _INS_PARTICIPANT, [{"room_id": r, "user_id": u} for r, u in adds]
+                )
+            if removes:
+                await session.execute(
+                    delete(RoomParticipant).where(
+                        tuple_(RoomParticipant.room_id, RoomParticipant.user_id).in_(removes)
+                    )
+                )
+            await session.commit()
+    except Exception as e:
+        for *_, fut in batch:
+            if not fut.done():
+                fut.set_exception(e)
+        return
+    for *_, fut in batch:
+        if not fut.done():
+            fut.set_result(None)
+    if log_debug:
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logger.debug(
+            "Participant batch flushed",
+            extra={"operation": "participant_flush", "adds": len(adds), "removes": len(removes), "duration_ms": round(elapsed, 1)},
+        )
 
 async def add_participant(session: AsyncSession, room_id: str, user_id: str):
     """Add a participant to a room - caller handles commit"""
+    if PARTICIPANT_COALESCE:
+        await submit_participant_op("add", room_id, user_id)
+        return
     # Single round-trip: insert and ignore if already exists
-    start_time = time.perf_counter()
+    log_info = logger.isEnabledFor(logging.INFO)
+    start_time = time.perf_counter() if log_info else 0.0
+    res = await session.execute(_INS_PARTICIPANT, {"room_id": room_id, "user_id": user_id})
+    if log_info:
+        inserted = (res.rowcount or 0) > 0
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logger.info("add_participant", extra={"duration_ms": round(elapsed, 1), "inserted": inserted})
+
+async def remove_participant(session: AsyncSession, room_id: str, user_id: str):
+    """Remove a participant from a room - caller handles commit"""
+    if PARTICIPANT_COALESCE:
+        await submit_participant_op("remove", room_id, user_id)
+        return
+    log_info = logger.isEnabledFor(logging.INFO)
+    start_time = time.perf_counter() if log_info else 0.0
+    # Delete directly without fetching first
+    res = await session.execute(_DEL_PARTICIPANT, {"room_id": room_id, "user_id": user_id})
+    # Don't commit here - let caller batch operations
+    if log_info:
+        elapsed = (time.perf_counter() - start_time) * 1000
+        deleted = int(res.rowcount or 0)
+        logger.info("remove_participant", extra={"duration_ms": round(elapsed, 1), "deleted_count": deleted})
+
+# Above this many rows, bulk participant inserts go through COPY (PostgreSQL only)
+PARTICIPANT_COPY_THRESHOLD = _parse_int(os.getenv("DB_PARTICIPANT_COPY_THRESHOLD"), 100)
+
+async def add_participants_bulk(session: AsyncSession, room_id: str, user_ids: List[str]) -> int:
+    """Add many participants to a room in one statement - caller handles commit.
+
+    Returns the number of rows actually inserted (existing members are skipped).
+    """
+    if not user_ids:
+        return 0
+    if len(user_ids) > PARTICIPANT_COPY_THRESHOLD and _is_postgres(session):
+        return await add_participants_copy(session, room_id, user_ids)
+    log_info = logger.isEnabledFor(logging.INFO)
+    start_time = time.perf_counter() if log_info else 0.0
     stmt = (
         pg_insert(RoomParticipant.__table__)
-        .values(room_id=room_id, user_id=user_id)
+        .values([{"room_id": room_id, "user_id": u} for u in dict.fromkeys(user_ids)])
         .on_conflict_do_nothing(index_elements=["room_id", "user_id"])
     )
     res = await session.execute(stmt)
-    inserted = (res.rowcount or 0) > 0
-    elapsed = (time.perf_counter() - start_time) * 1000
-    logger.info("add_participant", extra={"duration_ms": round(elapsed, 1), "inserted": inserted})
+    inserted = int(res.rowcount or 0)
+    if log_info:
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            "add_participants_bulk",
+            extra={"duration_ms": round(elapsed, 1), "requested": len(user_ids), "inserted": inserted},
+        )
+    return inserted
 
-async def remove_participant(session: AsyncSession, room_id: str, user_id: str):
-    """Remove a participant from a room - caller handles commit"""
-    start_time = time.perf_counter()
-    # Delete directly without fetching first
-    res = await session.execute(
-        delete(RoomParticipant).where(
-            RoomParticipant.room_id == room_id,
-            RoomParticipant.user_id == user_id
+async def add_participants_copy(session: AsyncSession, room_id: str, user_ids: List[str]) -> int:
+    """Add a large participant list via COPY - caller handles commit (PostgreSQL only).
+
+    Rows are COPYed into a session-local staging table and moved with
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING, so existing members are
+    skipped just like add_participant. Returns the number of rows inserted.
+    """
+    if not user_ids:
+        return 0
+    log_info = logger.isEnabledFor(logging.INFO)
+    start_time = time.perf_counter() if log_info else 0.0
+    # Run DDL through the session first so the transaction is open before
+    # the raw COPY; rows are cleared on commit and after each use.
+    await session.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS _participant_stage "
+        "(room_id text, user_id text) ON COMMIT DELETE ROWS"
+    ))
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    records = [(room_id, u) for u in dict.fromkeys(user_ids)]
+    await raw.driver_connection.copy_records_to_table(
+        "_participant_stage", records=records, columns=["room_id", "user_id"]
+    )
+    # joined_at comes from the column's server default
+    res = await session.execute(text(
+        "INSERT INTO roomparticipant (room_id, user_id) "
+        "SELECT room_id, user_id FROM _participant_stage "
+        "ON CONFLICT (room_id, user_id) DO NOTHING"
+    ))
+    await session.execute(text("DELETE FROM _participant_stage"))
+    inserted = int(res.rowcount or 0)
+    if log_info:
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            "add_participants_copy",
+            extra={"duration_ms": round(elapsed, 1), "requested": len(user_ids), "inserted": inserted},
         )
+    return inserted
+
+async def remove_participants_bulk(session: AsyncSession, room_id: str, user_ids: List[str]) -> int:
+    """Remove many participants from a room in one statement - caller handles commit.
+
+    Returns the number of rows deleted.
+    """
+    if not user_ids:
+        return 0
+    log_info = logger.isEnabledFor(logging.INFO)
+    start_time = time.perf_counter() if log_info else 0.0
+    res = await session.execute(
+        _DEL_PARTICIPANTS_IN, {"room_id": room_id, "user_ids": list(user_ids)}
     )
-    # Don't commit here - let caller batch operations
-    elapsed = (time.perf_counter() - start_time) * 1000
     deleted = int(res.rowcount or 0)
-    logger.info("remove_participant", extra={"duration_ms": round(elapsed, 1), "deleted_count": deleted})
+    if log_info:
+        elapsed = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            "remove_participants_bulk",
+            extra={"duration_ms": round(elapsed, 1), "requested": len(user_ids), "deleted_count": deleted},
+        )
+    return deleted
 
 def generate_room_id() -> str:
-    """Generate a random room ID"""
-    import random
-    import string
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+    """Generate a random, unguessable 6-character room ID (A-Z, 2-7)"""
+    # One urandom read; 4 bytes base32-encode to 7 chars, the first 6 are kept
+    return base64.b32encode(os.urandom(4))[:6].decode("ascii")
 
 async def get_room(session: AsyncSession, room_id: str) -> Optional[Room]:
     """Get a room by ID"""
-    result = await session.execute(select(Room).where(Room.room_id == room_id))
-    return result.scalars().first()
+    return await _get_room_cached(session, room_id)
 
 async def log_room_action(session: AsyncSession, room_id: str, action: str, user_id: str, data: dict = None):
     """Log room action - placeholder for now"""
     pass
 
 
-async def check_db_connectivity(timeout_seconds: float = 2.0) -> Tuple[bool, str, float]:
-    """Perform a simple async connectivity check: SELECT 1.
-    Returns (ok, detail, duration_ms).
-    """
+# Last connectivity probe result, refreshed in the background so frequent
+# health probes do not each check out a connection.
+HEALTH_REFRESH_INTERVAL = _parse_int(os.getenv("DB_HEALTH_REFRESH_INTERVAL"), 2)
+HEALTH_MAX_AGE = _parse_int(os.getenv("DB_HEALTH_MAX_AGE"), 5)
+try:
+    # The background refresh always uses the configured timeout, not whatever
+    # the caller that happened to start it passed in
+    HEALTH_TIMEOUT = float(os.getenv("DB_HEALTHCHECK_TIMEOUT", "2.0"))
+except ValueError:
+    HEALTH_TIMEOUT = 2.0
+_HEALTH_STATE = {"ok": True, "detail": "ok", "ts": 0.0, "dur": 0.0}
+_health_task: Optional[asyncio.Task] = None
+
+_PING_SQL = ";"
+
+async def _ping(conn) -> None:
+    if conn.dialect.driver == "asyncpg":
+        # asyncpg's execute() without arguments sends a simple-protocol query,
+        # so the empty statement is one round-trip with no prepare and no
+        # BEGIN; exec_driver_sql would still go through the dialect's
+        # transaction and prepared-statement path
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.execute(_PING_SQL)
+    else:
+        await conn.exec_driver_sql("SELECT 1")
+
+async def _connect_and_ping() -> None:
+    async with engine.connect() as conn:
+        await _ping(conn)
+
+async def _probe_db(timeout_seconds: float) -> Tuple[bool, str, float]:
+    """Ping the database on a pooled connection and record the result."""
     start = time.perf_counter()
     try:
-        async with engine.connect() as conn:
-            # Use a simple SELECT 1 with timeout
-            await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=timeout_seconds)
+        # The timeout covers checkout/connect too, not just the query
+        await asyncio.wait_for(_connect_and_ping(), timeout=timeout_seconds)
         dur_ms = (time.perf_counter() - start) * 1000
         logger.debug("DB healthcheck ok", extra={"duration_ms": round(dur_ms, 1)})
-        return True, "ok", dur_ms
+        ok, detail = True, "ok"
     except Exception as e:
         dur_ms = (time.perf_counter() - start) * 1000
         logger.warning("DB healthcheck failed", extra={"error": str(e), "duration_ms": round(dur_ms, 1)})
-        return False, str(e), dur_ms
+        ok, detail = False, str(e)
+    _HEALTH_STATE.update(ok=ok, detail=detail, ts=time.monotonic(), dur=dur_ms)
+    return ok, detail, dur_ms
+
+async def _health_refresh_loop():
+    while True:
+        await asyncio.sleep(HEALTH_REFRESH_INTERVAL)
+        await _probe_db(HEALTH_TIMEOUT)
 
+async def stop_health_refresh():
+    """Cancel the background health refresh task, if running."""
+    global _health_task
+    task, _health_task = _health_task, None
+    if task is None or task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+async def check_db_connectivity(timeout_seconds: float = 2.0, max_age_seconds: Optional[float] = None) -> Tuple[bool, str, float]:
+    """Perform a simple async connectivity check (empty-query ping).
+
+    Returns the background-refreshed result when it is younger than
+    `max_age_seconds` (default DB_HEALTH_MAX_AGE); pass 0 to force a probe.
+    `timeout_seconds` only bounds a probe made by this call; the background
+    refresh uses DB_HEALTHCHECK_TIMEOUT.
+    Returns (ok, detail, duration_ms).
+    """
+    global _health_task
+    max_age = HEALTH_MAX_AGE if max_age_seconds is None else max_age_seconds
+    if _HEALTH_STATE["ts"] and time.monotonic() - _HEALTH_STATE["ts"] <= max_age:
+        return _HEALTH_STATE["ok"], _HEALTH_STATE["detail"], _HEALTH_STATE["dur"]
+    result = await _probe_db(timeout_seconds)
+    if HEALTH_REFRESH_INTERVAL > 0 and (_health_task is None or _health_task.done()):
+        _health_task = asyncio.create_task(_health_refresh_loop())
+    return result
@@ -2,10 +2,15 @@ import logging
 import json
 import os
 import sys
+import threading
+import time
 from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
-from queue import Queue
+from queue import Queue, Full, Empty
 from contextvars import ContextVar
-from datetime import datetime, timezone
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
 import atexit
 
 # Built-in defaults with environment variable overrides
@@ -25,6 +30,7 @@ LOG_JSON = _env_bool("LOG_JSON", False)  # Human-readable logs by default
 LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(50 * 1024 * 1024)))
 LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
 LOG_ASYNC_QUEUE = _env_bool("LOG_ASYNC_QUEUE", True)  # Keep async queue for app logger handlers
+LOG_QUEUE_MAX = int(os.getenv("LOG_QUEUE_MAX", "100000"))  # Oldest records are dropped beyond this
 DB_LOG_LEVEL = os.getenv("DB_LOG_LEVEL", "WARNING").upper()  # DB/driver logs default to WARNING
 UVICORN_ACCESS_LEVEL = os.getenv("UVICORN_ACCESS_LEVEL", "INFO").upper()  # Uvicorn access logs default to INFO
 
@@ -38,24 +44,28 @@ request_id_ctx: ContextVar[str | None] = ContextVar("request_id", default=None)
 class RequestIdFilter(logging.Filter):
     """Inject request_id from ContextVar into records if not already present."""
     def filter(self, record: logging.LogRecord) -> bool:
-        try:
-            if not hasattr(record, "request_id"):
-                rid = request_id_ctx.get()
-                if rid is not None:
-                    setattr(record, "request_id", rid)
-        except Exception:
-            # Never block logging on filter errors
-            pass
+        # Plain dict lookup; ContextVar.get() cannot raise since it has a default
+        if "request_id" not in record.__dict__:
+            rid = request_id_ctx.get()
+            if rid is not None:
+                record.request_id = rid
         return True
 
 class JSONFormatter(logging.Formatter):
     def __init__(self, ensure_ascii: bool = False):
         super().__init__()
         self.ensure_ascii = ensure_ascii
+        # Seconds prefix is reused for every record logged within that second
+        self._ts_sec = -1
+        self._ts_prefix = ""
     def _ts(self, record: logging.LogRecord) -> str:
-        # Faster UTC timestamp with millisecond precision
-        dt = datetime.fromtimestamp(record.created, tz=timezone.utc)
-        return dt.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        # UTC timestamp with millisecond precision, no datetime allocation
+        t = record.created
+        sec = int(t)
+        if sec != self._ts_sec:
+            self._ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+            self._ts_sec = sec
+        return f"{self._ts_prefix}.{int((t - sec) * 1000):03d}Z"
 
     def format(self, record: logging.LogRecord) -> str:
         data = {
@@ -84,27 +94,70 @@ class JSONFormatter(logging.Formatter):
         for key in extras:
             if hasattr(record, key):
                 data[key] = getattr(record, key)
+        # orjson never escapes non-ASCII, so ASCII-only output stays on stdlib json
+        if orjson is not None and not self.ensure_ascii:
+            return orjson.dumps(data, default=str).decode("utf-8")
         return json.dumps(data, ensure_ascii=self.ensure_ascii, separators=(",", ":"))
 
+class _NonAsciiToQuestion(dict):
+    """str.translate table: ASCII passes through, anything else becomes '?'."""
+    def __missing__(self, codepoint: int) -> int:
+        if codepoint < 0x80:
+            raise LookupError(codepoint)
+        return 0x3F
+
+_ASCII_TBL = _NonAsciiToQuestion()
+
 class AsciiSafeFilter(logging.Filter):
     """Ensure record fields are ASCII-only to avoid console encoding issues."""
+    _KEYS = (
+        "request_id", "uid", "room_id", "song_id", "page", "method", "path",
+        "status_code", "client_ip", "ws_event"
+    )
     def filter(self, record: logging.LogRecord) -> bool:
         try:
-            if isinstance(record.msg, str):
-                record.msg = record.msg.encode("ascii", "replace").decode("ascii")
+            msg = record.msg
+            if isinstance(msg, str) and not msg.isascii():
+                record.msg = msg.translate(_ASCII_TBL)
             # Sanitize common extra fields that may be strings
-            for key in [
-                "request_id", "uid", "room_id", "song_id", "page", "method", "path",
-                "status_code", "client_ip", "ws_event"
-            ]:
-                if hasattr(record, key):
-                    val = getattr(record, key)
-                    if isinstance(val, str):
-                        setattr(record, key, val.encode("ascii", "replace").decode("ascii"))
+            for key in self._KEYS:
+                val = getattr(record, key, None)
+                if isinstance(val, str) and not val.isascii():
+                    setattr(record, key, val.translate(_ASCII_TBL))
         except Exception:
             pass
         return True
 
+# Records discarded because the async log queue was full. Loggers on any
+# thread enqueue, so the counter and the evict-then-put are under one lock.
+_QUEUE_STATS = {"dropped": 0}
+_QUEUE_LOCK = threading.Lock()
+
+def _put_drop_oldest(queue: Queue, item) -> None:
+    """Put without blocking; when the queue is full, evict the oldest item first."""
+    try:
+        queue.put_nowait(item)
+        return
+    except Full:
+        pass
+    with _QUEUE_LOCK:
+        try:
+            queue.get_nowait()
+            _QUEUE_STATS["dropped"] += 1
+            queue.put_nowait(item)
+        except (Empty, Full):
+            _QUEUE_STATS["dropped"] += 1
+
+class DropOldestQueueHandler(QueueHandler):
+    """QueueHandler that evicts the oldest queued record instead of blocking or growing."""
+    def enqueue(self, record: logging.LogRecord) -> None:
+        _put_drop_oldest(self.queue, record)
+
+class DropOldestQueueListener(QueueListener):
+    """QueueListener whose stop() sentinel cannot fail on a full queue."""
+    def enqueue_sentinel(self) -> None:
+        _put_drop_oldest(self.queue, self._sentinel)
+
 def _build_handlers():
     handlers = []
     # Console handler (stdout)
@@ -170,7 +223,7 @@ def _configure_db_loggers(app_logger: logging.Logger):
                 q = getattr(app_logger, "_queue")
                 already = any(isinstance(h, QueueHandler) and getattr(h, 'queue', None) is q for h in lgr.handlers)
                 if not already:
-                    lgr.addHandler(QueueHandler(q))
+                    lgr.addHandler(DropOldestQueueHandler(q))
                 lgr.propagate = False
             else:
                 # Mirror app logger handlers directly
@@ -195,10 +248,10 @@ def _configure_logger() -> logging.Logger:
         # Add correlation filter to root app logger so child loggers inherit it
         logger.addFilter(RequestIdFilter())
         if LOG_ASYNC_QUEUE:
-            queue = Queue(-1)
-            qh = QueueHandler(queue)
+            queue = Queue(maxsize=max(0, LOG_QUEUE_MAX))
+            qh = DropOldestQueueHandler(queue)
             logger.addHandler(qh)
-            listener = QueueListener(queue, *handlers, respect_handler_level=True)
+            listener = DropOldestQueueListener(queue, *handlers, respect_handler_level=True)
             listener.start()
             logger._listener = listener  # type: ignore[attr-defined]
             logger._queue = queue        # type: ignore[attr-defined]
@@ -225,6 +278,16 @@ def _shutdown_logging_listener():
 
 atexit.register(_shutdown_logging_listener)
 
+def get_log_queue_stats() -> dict:
+    """Return async log queue depth and the number of records dropped so far."""
+    queue = getattr(logger, "_queue", None)
+    return {
+        "enabled": queue is not None,
+        "queued": queue.qsize() if queue is not None else 0,
+        "max_size": LOG_QUEUE_MAX,
+        "dropped": _QUEUE_STATS["dropped"],
+    }
+
 # Helper APIs to manage request_id context
 def set_request_id(request_id: str | None):
     """Set the current request_id for log correlation (returns reset token)."""
@@ -4,36 +4,46 @@ This module provides all path-related dependencies used throughout the applicati
 """
 
 import os
-from fastapi import Depends
 
 # Base directory for path calculations
 # Go up 3 levels: runtime/ -> scripts/ -> server/
 _base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Paths are fixed for the life of the process, so they are computed once here.
+# The zero-argument getters below remain as FastAPI dependencies so tests can
+# swap them via app.dependency_overrides.
+DATABASE_DIR = os.path.join(_base_dir, "song_data")
+SONGS_DIR = os.path.join(DATABASE_DIR, "songs")
+METADATA_PATH = os.path.join(DATABASE_DIR, "songs_metadata.json")
+SONGS_PDF_DIR = os.path.join(DATABASE_DIR, "songs_pdf")
+SONGS_IMG_DIR = os.path.join(DATABASE_DIR, "songs_img")
+ROOM_DATABASE_DIR = os.path.join(_base_dir, "room_database")
+SONGS_LIST_GZIP_PATH = os.path.join(DATABASE_DIR, "songs_list.json.gz")
+
 def get_database_dir() -> str:
     """Returns the absolute path to the song database directory."""
-    return os.path.join(_base_dir, "song_data")
+    return DATABASE_DIR
 
-def get_songs_dir(database_dir: str = Depends(get_database_dir)) -> str:
+def get_songs_dir() -> str:
     """Returns the absolute path to the songs directory inside the database."""
-    return os.path.join(database_dir, "songs")
+    return SONGS_DIR
 
-def get_metadata_path(database_dir: str = Depends(get_database_dir)) -> str:
+def get_metadata_path() -> str:
     """Returns the absolute path to the songs_metadata.json file."""
-    return os.path.join(database_dir, "songs_metadata.json")
+    return METADATA_PATH
 
-def get_songs_pdf_dir(database_dir: str = Depends(get_database_dir)) -> str:
+def get_songs_pdf_dir() -> str:
     """Returns the absolute path to the songs_pdf directory."""
-    return os.path.join(database_dir, "songs_pdf")
+    return SONGS_PDF_DIR
 
-def get_songs_img_dir(database_dir: str = Depends(get_database_dir)) -> str:
+def get_songs_img_dir() -> str:
     """Returns the absolute path to the songs_img directory."""
-    return os.path.join(database_dir, "songs_img")
+    return SONGS_IMG_DIR
 
 def get_room_database_dir() -> str:
     """Returns the absolute path to the room database directory."""
-    return os.path.join(_base_dir, "room_database")
+    return ROOM_DATABASE_DIR
 
-def get_songs_list_gzip_path(database_dir: str = Depends(get_database_dir)) -> str:
+def get_songs_list_gzip_path() -> str:
     """Returns the absolute path to the gzipped songs list file."""
-    return os.path.join(database_dir, "songs_list.json.gz")
+    return SONGS_LIST_GZIP_PATH
@@ -1,24 +1,118 @@
 import json
 import asyncio
+import logging
 import os
 import uuid
 import time
-from typing import Dict, List, Optional, Set, Any, Union
+import hashlib
+from collections import deque
+from typing import Dict, List, Optional, Set, Any, Tuple, Union
 
 from autobahn.asyncio.websocket import WebSocketServerProtocol, WebSocketServerFactory
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
 
 # Import centralized auth middleware
 from scripts.runtime.auth_middleware import authenticate_websocket, verify_room_host
 
 from scripts.runtime.logger import logger as _app_logger, set_request_id, reset_request_id
+from scripts.runtime.paths import get_songs_img_dir
 from scripts.runtime.database import get_db_session, get_room_by_id_from_db, get_song_by_id_from_db, Room, Song
 
 # Child logger and WS config
 logger = _app_logger.getChild("ws")
 REQUEST_ID_HEADER = os.getenv("REQUEST_ID_HEADER", "X-Request-ID")
 
+# Short-lived memo of token verification results so reconnect storms do not
+# re-verify the same token. Successes are kept for WS_AUTH_CACHE_TTL seconds
+# but never past the token's own `exp`; failures only for the shorter
+# WS_AUTH_NEGATIVE_TTL to blunt bad-token floods.
+_AUTH_TTL = float(os.getenv("WS_AUTH_CACHE_TTL", "30"))
+_AUTH_NEGATIVE_TTL = float(os.getenv("WS_AUTH_NEGATIVE_TTL", "5"))
+_AUTH_CACHE_MAX = 1024
+_AUTH_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+async def _authenticate_cached(token: str) -> Dict[str, Any]:
+    """authenticate_websocket() memoized by token hash for a short TTL."""
+    if _AUTH_TTL <= 0:
+        return await authenticate_websocket(token)
+    key = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+    now = time.time()
+    hit = _AUTH_CACHE.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    result = await authenticate_websocket(token)
+    if 'error' in result:
+        expires = now + _AUTH_NEGATIVE_TTL
+    else:
+        expires = min(now + _AUTH_TTL, float(result.get('exp', now + _AUTH_TTL)))
+    _AUTH_CACHE.pop(key, None)
+    if len(_AUTH_CACHE) >= _AUTH_CACHE_MAX:
+        # Dicts keep insertion order, so the first key is the oldest entry
+        _AUTH_CACHE.pop(next(iter(_AUTH_CACHE)))
+    _AUTH_CACHE[key] = (expires, result)
+    return result
+
+# Log extras for a connection that closed before onConnect ran
+_NO_CONN_EXTRA: Dict[str, Any] = {"request_id": "-"}
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    """Serialize an outbound message to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(message)
+    # Compact separators match orjson byte for byte, which _batch_encoded
+    # relies on to recognise an existing envelope
+    return json.dumps(message, separators=(',', ':')).encode('utf8')
+
+_BATCH_PREFIX = b'{"type":"batched_update","data":{"messages":['
+_BATCH_SUFFIX = b']}}'
+
+def _batch_encoded(payloads: List[bytes], scratch: bytearray) -> bytes:
+    """Wrap already-encoded messages in a batched_update envelope without re-encoding.
+
+    The envelope is written in place into the caller's reusable scratch buffer,
+    which only ever grows to its high-water mark, so the returned bytes is the
+    only allocation. A payload that is itself a batched_update contributes its
+    inner messages, so clients never see a nested envelope.
+    """
+    prefix_len, suffix_len = len(_BATCH_PREFIX), len(_BATCH_SUFFIX)
+    payloads = [
+        memoryview(p)[prefix_len:len(p) - suffix_len] if p.startswith(_BATCH_PREFIX) else p
+        for p in payloads
+    ]
+    total = prefix_len + suffix_len + len(payloads) - 1 + sum(map(len, payloads))
+    if len(scratch) < total:
+        scratch.extend(bytes(total - len(scratch)))
+    view = memoryview(scratch)
+    pos = len(_BATCH_PREFIX)
+    view[:pos] = _BATCH_PREFIX
+    for i, payload in enumerate(payloads):
+        if i:
+            view[pos] = 0x2C  # ','
+            pos += 1
+        view[pos:pos + len(payload)] = payload
+        pos += len(payload)
+    view[pos:total] = _BATCH_SUFFIX
+    try:
+        return bytes(view[:total])
+    finally:
+        view.release()
+
 class MusicRoomProtocol(WebSocketServerProtocol):
     # WebSocket protocol for handling music room connections and events
+
+    # Autobahn's base classes keep a __dict__, so this does not remove it, but
+    # our own per-connection state lives in slots: smaller instances and
+    # faster attribute access on the send path
+    __slots__ = (
+        'request_id', 'user_id', 'room_id', 'auth_token', '_base_extra',
+        '_ws_send_queue_max', '_ws_drop_policy', '_ws_yield_threshold',
+        '_ws_slow_client_drop_threshold', '_ws_batch_after_n_msgs', '_ws_buffer_threshold',
+        '_scratch', '_send_queue', '_send_event', '_writer_task',
+        '_dropped_count', '_peak_queue', '_closed',
+    )
     
     def onConnect(self, request):
         # Normalize headers for case-insensitive access
@@ -30,13 +124,12 @@ class MusicRoomProtocol(WebSocketServerProtocol):
         rid_header_lower = REQUEST_ID_HEADER.lower()
         self.request_id = headers_lower.get(rid_header_lower, str(uuid.uuid4()))
         token = set_request_id(getattr(self, 'request_id', None))
-        logger.info(
-            "WS connect",
-            extra={
-                "request_id": self.request_id,
-                "client_ip": getattr(request, 'peer', 'unknown'),
-            },
-        )
+        # Fields shared by every log record of this connection, built once
+        self._base_extra = {
+            "request_id": self.request_id,
+            "client_ip": getattr(request, 'peer', 'unknown'),
+        }
+        logger.info("WS connect", extra=self._base_extra)
         reset_request_id(token)
         self.user_id = None
         self.room_id = None
@@ -61,19 +154,19 @@ class MusicRoomProtocol(WebSocketServerProtocol):
             if not self.auth_token:
                 logger.warning(
                     "WS rejected: missing auth token",
-                    extra={"request_id": getattr(self, 'request_id', '-'), "client_ip": getattr(self, 'peer', 'unknown')},
+                    extra=self._base_extra,
                 )
                 self.sendClose(code=4000, reason="Authentication required")
                 return
 
             # Use centralized authentication
-            result = await authenticate_websocket(self.auth_token)
+            result = await _authenticate_cached(self.auth_token)
 
             # Check if authentication failed
             if 'error' in result:
                 logger.warning(
                     "WS auth failed",
-                    extra={"request_id": self.request_id, "client_ip": getattr(self, 'peer', 'unknown'), "status_code": result.get('status')},
+                    extra={**self._base_extra, "status_code": result.get('status')},
                 )
                 # Use valid WebSocket close code (4000-4999 range for custom codes)
                 close_code = 4001  # Custom: Authentication failed
@@ -91,13 +184,13 @@ class MusicRoomProtocol(WebSocketServerProtocol):
             self.factory.register_connection(self)
 
             # Send confirmation message
-            self.sendMessage(json.dumps({
+            self.sendMessage(_encode({
                 "type": "connection_success",
                 "user_id": self.user_id
-            }).encode('utf8'))
+            }))
             logger.info(
                 "WS connected",
-                extra={"request_id": self.request_id, "uid": self.user_id, "client_ip": getattr(self, 'peer', 'unknown')},
+                extra={**self._base_extra, "uid": self.user_id},
             )
         finally:
             reset_request_id(token)
@@ -118,18 +211,18 @@ class MusicRoomProtocol(WebSocketServerProtocol):
                     else:
                         logger.warning(
                             "WS unknown message type",
-                            extra={"request_id": getattr(self, 'request_id', '-'), "uid": self.user_id, "room_id": getattr(self, 'room_id', None), "ws_event": "unknown_type", "msg_type": msg_type},
+                            extra={**self._base_extra, "uid": self.user_id, "room_id": self.room_id, "ws_event": "unknown_type", "msg_type": msg_type},
                         )
                 except json.JSONDecodeError:
                     logger.warning(
                         "WS invalid JSON",
-                        extra={"request_id": getattr(self, 'request_id', '-'), "uid": self.user_id, "room_id": getattr(self, 'room_id', None)},
+                        extra={**self._base_extra, "uid": self.user_id, "room_id": self.room_id},
                     )
                 except Exception as e:
                     logger.error(
                         "WS message handling error",
                         exc_info=True,
-                        extra={"request_id": getattr(self, 'request_id', '-'), "uid": self.user_id, "room_id": getattr(self, 'room_id', None)},
+                        extra={**self._base_extra, "uid": self.user_id, "room_id": self.room_id},
                     )
             else:
                 # Binary messages are currently ignored
@@ -146,52 +239,52 @@ class MusicRoomProtocol(WebSocketServerProtocol):
             reset_request_id(token)
             return
         
-        # Get current room state from database
+        # Snapshot of the room for join_room_success. Costs a DB roundtrip per
+        # join; deployments whose clients fetch state over HTTP can turn it off.
         room_state = None
-        try:
-            async for session in get_db_session():
-                room = await get_room_by_id_from_db(session, room_id)
-                if room:
-                    # Get song details if there's a current song
-                    song_details = None
-                    if room.current_song:
-                        try:
-                            song = await get_song_by_id_from_db(session, room.current_song)
-                            if song:
-                                song_details = {
-                                    'id': song.id,
-                                    'title': song.title,
-                                    'artist': song.artist,
-                                    'total_pages': getattr(song, 'page_count', 1)
-                                }
-                        except Exception as e:
-                            logger.error(f"Failed to get song details for WebSocket join: {e}")
+        if self.factory.ws_room_state_on_join:
+            try:
+                async for session in get_db_session():
+                    room = await get_room_by_id_from_db(session, room_id)
+                    if room:
+                        # Get song details if there's a current song
+                        song_details = None
+                        if room.current_song:
+                            try:
+                                song = await get_song_by_id_from_db(session, room.current_song)
+                                if song:
+                                    song_details = {
+                                        'id': song.id,
+                                        'title': song.title,
+                                        'artist': song.artist,
+                                        'total_pages': getattr(song, 'page_count', 1)
+                                    }
+                            except Exception as e:
+                                logger.error(f"Failed to get song details for WebSocket join: {e}")
                     
-                    # Compute image ETag for current page
-                    image_etag = None
-                    if room.current_song and room.current_page:
-                        try:
-                            import os
-                            from scripts.runtime.paths import get_songs_img_dir
-                            songs_img_dir = get_songs_img_dir()
-                            image_path = os.path.join(songs_img_dir, room.current_song, f"page_{room.current_page}.webp")
-                            st = os.stat(image_path)
-                            image_etag = f"W/\"{st.st_size:x}-{int(st.st_mtime)}\""
-                        except Exception as e:
-                            logger.error(f"Failed to compute image ETag for WebSocket join: {e}")
-                            image_etag = f"error-{int(time.time())}"
+                        # Compute image ETag for current page
+                        image_etag = None
+                        if room.current_song and room.current_page:
+                            try:
+                                songs_img_dir = get_songs_img_dir()
+                                image_path = os.path.join(songs_img_dir, room.current_song, f"page_{room.current_page}.webp")
+                                st = os.stat(image_path)
+                                image_etag = f"W/\"{st.st_size:x}-{int(st.st_mtime)}\""
+                            except Exception as e:
+                                logger.error(f"Failed to compute image ETag for WebSocket join: {e}")
+                                image_etag = f"error-{int(time.time())}"
                     
-                    room_state = {
-                        "room_id": room.room_id,
-                        "host_id": room.host_id,
-                        "current_song": room.current_song,
-                        "current_page": room.current_page,
-                        "song_details": song_details,
-                        "image_etag": image_etag
-                    }
-        except Exception as e:
-            logger.error(f"Database error while getting room state {room_id}: {e}")
-            # Continue despite errors for better resilience
+                        room_state = {
+                            "room_id": room.room_id,
+                            "host_id": room.host_id,
+                            "current_song": room.current_song,
+                            "current_page": room.current_page,
+                            "song_details": song_details,
+                            "image_etag": image_etag
+                        }
+            except Exception as e:
+                logger.error(f"Database error while getting room state {room_id}: {e}")
+                # Continue despite errors for better resilience
         
         old_room = self.room_id
         self.room_id = room_id
@@ -202,12 +295,12 @@ class MusicRoomProtocol(WebSocketServerProtocol):
             self.factory.leave_room(self, old_room)
             logger.info(
                 "WS moved rooms",
-                extra={"request_id": getattr(self, 'request_id', '-'), "uid": self.user_id, "room_id": room_id},
+                extra={**self._base_extra, "uid": self.user_id, "room_id": room_id},
             )
         else:
             logger.info(
                 "WS joined room",
-                extra={"request_id": getattr(self, 'request_id', '-'), "uid": self.user_id, "room_id": room_id},
+                extra={**self._base_extra, "uid": self.user_id, "room_id": room_id},
             )
         
         # Send join success with current room state
@@ -215,7 +308,7 @@ class MusicRoomProtocol(WebSocketServerProtocol):
         if room_state:
             join_response["room_state"] = room_state
             
-        self.sendMessage(json.dumps(join_response).encode('utf8'))
+        self.sendMessage(_encode(join_response))
         reset_request_id(token)
         return
     
@@ -229,23 +322,23 @@ class MusicRoomProtocol(WebSocketServerProtocol):
             
         room_id = self.room_id
         # Notify other room members BEFORE removing membership to ensure the room still exists
-        asyncio.create_task(self.factory.broadcast_to_room(room_id, {
+        self.factory.broadcast_to_room(room_id, {
             "type": "participant_left",
             "user_id": self.user_id
-        }, exclude=self))
+        }, exclude=self)
         
         # Now remove from the room registry
         self.factory.leave_room(self, room_id)
         self.room_id = None
         
         # Send confirmation to the sender
-        self.sendMessage(json.dumps({
+        self.sendMessage(_encode({
             "type": "room_left",
             "room_id": room_id
-        }).encode('utf8'))
+        }))
         logger.info(
             "WS left room",
-            extra={"request_id": getattr(self, 'request_id', '-'), "uid": self.user_id, "room_id": room_id},
+            extra={**self._base_extra, "uid": self.user_id, "room_id": room_id},
         )
         reset_request_id(token)
     
@@ -256,6 +349,7 @@ class MusicRoomProtocol(WebSocketServerProtocol):
         # Clean up room membership if needed
         room_id = getattr(self, 'room_id', None)
         user_id = getattr(self, 'user_id', 'unknown')
+        base_extra = getattr(self, '_base_extra', _NO_CONN_EXTRA)
         
         # Unregister connection FIRST to prevent receiving own messages
         if hasattr(self, 'user_id') and self.user_id:
@@ -266,19 +360,19 @@ class MusicRoomProtocol(WebSocketServerProtocol):
             self.factory.leave_room(self, room_id)
             
             # THEN notify others (exclude=self is now safe since we're not in connections)
-            asyncio.create_task(self.factory.broadcast_to_room(room_id, {
+            self.factory.broadcast_to_room(room_id, {
                 "type": "participant_left",
                 "user_id": user_id
-            }))
+            })
             
             logger.info(
                 "WS disconnected in room",
-                extra={"request_id": getattr(self, 'request_id', '-'), "uid": user_id, "room_id": room_id},
+                extra={**base_extra, "uid": user_id, "room_id": room_id},
             )
         else:
             logger.info(
                 "WS disconnected",
-                extra={"request_id": getattr(self, 'request_id', '-'), "uid": user_id},
+                extra={**base_extra, "uid": user_id},
             )
 
         # Stop writer and clear queue
@@ -290,7 +384,7 @@ class MusicRoomProtocol(WebSocketServerProtocol):
     
     def send_json(self, data):
         """Send a JSON message to the client."""
-        self.sendMessage(json.dumps(data).encode('utf8'))
+        self.sendMessage(_encode(data))
     
     def send_error(self, message):
         """Send an error message to the client."""
@@ -304,17 +398,18 @@ class MusicRoomProtocol(WebSocketServerProtocol):
         # Read settings from factory (with fallbacks)
         f = getattr(self, 'factory', None)
         self._ws_send_queue_max = getattr(f, 'ws_send_queue_max', 100)
-        self._ws_coalesce_window_ms = getattr(f, 'ws_coalesce_window_ms', 50)
         self._ws_drop_policy = getattr(f, 'ws_drop_policy', 'oldest')
         self._ws_yield_threshold = getattr(f, 'ws_yield_threshold_bytes', 262144)
         self._ws_slow_client_drop_threshold = getattr(f, 'ws_slow_client_disconnect_after_drops', 0)
-        self._coalesce_types: Set[str] = getattr(f, 'coalesce_types', {"page_updated", "song_updated"})
-
-        self._send_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=self._ws_send_queue_max)
+        self._ws_batch_after_n_msgs = getattr(f, 'ws_batch_after_n_msgs', 3)
+        self._ws_buffer_threshold = getattr(f, 'ws_buffer_threshold_bytes', 8192)
+
+        # Reused to assemble batched frames (autobahn needs bytes, so one copy remains)
+        self._scratch = bytearray(4096)
+        # Plain deque + Event: no per-item future or waiter bookkeeping
+        self._send_queue: deque = deque()
+        self._send_event = asyncio.Event()
         self._writer_task: Optional[asyncio.Task] = asyncio.create_task(self._writer())
-        self._coalesce_until: float = 0.0
-        self._coalesce_latest: Dict[str, Dict[str, Any]] = {}
-        self._coalesce_task: Optional[asyncio.Task] = None
         self._dropped_count: int = 0
         self._peak_queue: int = 0
         self._closed: bool = False
@@ -324,97 +419,48 @@ class MusicRoomProtocol(WebSocketServerProtocol):
         self._closed = True
         if self._writer_task and not self._writer_task.done():
             self._writer_task.cancel()
-        # drain queue best-effort
-        while not self._send_queue.empty():
-            try:
-                self._send_queue.get_nowait()
-            except Exception:
-                break
+        self._send_queue.clear()
 
     def enqueue_message(self, message: Dict[str, Any]) -> bool:
-        """Enqueue a JSON message with coalescing and drop policy. Returns True if accepted."""
+        """Encode and enqueue a JSON message with drop policy. Returns True if accepted.
+
+        Noisy types are coalesced once per room by the factory, not here.
+        """
+        try:
+            return self.enqueue_bytes(_encode(message))
+        except Exception:
+            logger.error("WS enqueue error", exc_info=True)
+            return False
+
+    def enqueue_bytes(self, encoded: bytes) -> bool:
+        """Enqueue an already-encoded message with drop policy. Returns True if accepted.
+
+        Broadcasts encode once and hand the same bytes object to every recipient.
+        """
         try:
-            msg_type = message.get('type')
-            now = time.monotonic()
-
-            # Coalesce noisy types within window
-            if msg_type in self._coalesce_types and self._ws_coalesce_window_ms > 0:
-                window_s = self._ws_coalesce_window_ms / 1000.0
-                # Start window if expired
-                if now >= self._coalesce_until:
-                    self._coalesce_until = now + window_s
-                    # schedule flush
-                    if not self._coalesce_task or self._coalesce_task.done():
-                        self._coalesce_task = asyncio.create_task(self._flush_coalesced_after(window_s))
-                # store latest - this will be sent later during flush
-                self._coalesce_latest[msg_type] = message
-                # Return True but log that message is coalesced, not immediately sent
-                logger.debug("WS message coalesced", extra={"uid": getattr(self, 'user_id', None), "type": msg_type})
-                return True
-
-            # Non-coalescable -> encode and enqueue now
-            encoded = json.dumps(message).encode('utf8')
-            if self._send_queue.full():
+            queue = self._send_queue
+            if 0 < self._ws_send_queue_max <= len(queue):
                 # Apply drop policy
                 policy = (self._ws_drop_policy or 'oldest').lower()
                 if policy == 'newest':
                     self._dropped_count += 1
                     self._maybe_disconnect_for_drops()
-                    logger.warning("WS drop newest", extra={"uid": getattr(self, 'user_id', None), "q": self._send_queue.qsize()})
+                    logger.warning("WS drop newest", extra={"uid": getattr(self, 'user_id', None), "q": len(queue)})
                     return False
                 # default: drop oldest
-                try:
-                    _ = self._send_queue.get_nowait()
-                    self._dropped_count += 1
-                    self._maybe_disconnect_for_drops()
-                    logger.warning("WS drop oldest", extra={"uid": getattr(self, 'user_id', None), "q": self._send_queue.qsize()})
-                except asyncio.QueueEmpty:
-                    pass
-            try:
-                self._send_queue.put_nowait(encoded)
-                self._peak_queue = max(self._peak_queue, self._send_queue.qsize())
-                return True
-            except asyncio.QueueFull:
+                queue.popleft()
                 self._dropped_count += 1
                 self._maybe_disconnect_for_drops()
-                logger.error("WS queue full after drop", extra={"uid": getattr(self, 'user_id', None)})
-                return False
+                logger.warning("WS drop oldest", extra={"uid": getattr(self, 'user_id', None), "q": len(queue)})
+            queue.append(encoded)
+            self._send_event.set()
+            if len(queue) > self._peak_queue:
+                self._peak_queue = len(queue)
+            return True
         except Exception:
             logger.error("WS enqueue error", exc_info=True)
             return False
 
-    async def _flush_coalesced_after(self, delay_s: float):
-        try:
-            await asyncio.sleep(delay_s)
-            pending = self._coalesce_latest
-            self._coalesce_latest = {}
-            for _type, msg in pending.items():
-                encoded = json.dumps(msg).encode('utf8')
-                if self._send_queue.full():
-                    policy = (self._ws_drop_policy or 'oldest').lower()
-                    if policy != 'newest':
-                        try:
-                            _ = self._send_queue.get_nowait()
-                        except asyncio.QueueEmpty:
-                            pass
-                    else:
-                        # newest policy: skip enqueuing coalesced if full
-                        self._dropped_count += 1
-                        self._maybe_disconnect_for_drops()
-                        logger.warning("WS coalesced drop newest", extra={"uid": getattr(self, 'user_id', None)})
-                        continue
-                try:
-                    self._send_queue.put_nowait(encoded)
-                    self._peak_queue = max(self._peak_queue, self._send_queue.qsize())
-                except asyncio.QueueFull:
-                    self._dropped_count += 1
-                    self._maybe_disconnect_for_drops()
-                    logger.error("WS coalesced queue full", extra={"uid": getattr(self, 'user_id', None)})
-        except asyncio.CancelledError:
-            pass
-        except Exception:
-            logger.error("WS coalesce flush error", exc_info=True)
-
     def _maybe_disconnect_for_drops(self):
         if self._ws_slow_client_drop_threshold and self._dropped_count >= self._ws_slow_client_drop_threshold:
             try:
@@ -423,10 +469,30 @@ class MusicRoomProtocol(WebSocketServerProtocol):
                 pass
 
     async def _writer(self):
+        # Hysteresis: while the queue keeps draining, the first few messages of
+        # a burst go out one frame each for latency; after that, whatever is
+        # already queued (up to the byte threshold) is merged into one
+        # batched_update frame. The burst count resets once the queue is empty.
+        sent_in_burst = 0
+        queue = self._send_queue
         try:
             while not self._closed:
-                payload = await self._send_queue.get()
+                if not queue:
+                    self._send_event.clear()
+                    await self._send_event.wait()
+                    continue
+                payload = queue.popleft()
+                if sent_in_burst >= self._ws_batch_after_n_msgs and queue:
+                    parts = [payload]
+                    size = len(payload)
+                    while queue and size < self._ws_buffer_threshold:
+                        nxt = queue.popleft()
+                        parts.append(nxt)
+                        size += len(nxt)
+                    if len(parts) > 1:
+                        payload = _batch_encoded(parts, self._scratch)
                 await self._send_bytes(payload)
+                sent_in_burst = sent_in_burst + 1 if queue else 0
                 if len(payload) >= self._ws_yield_threshold:
                     await asyncio.sleep(0)
         except asyncio.CancelledError:
@@ -467,7 +533,25 @@ class MusicRoomFactory(WebSocketServerFactory):
         self.ws_max_message_bytes = _to_int('WS_MAX_MESSAGE_BYTES', 1048576)
         self.ws_yield_threshold_bytes = _to_int('WS_YIELD_THRESHOLD_BYTES', 262144)
         self.ws_slow_client_disconnect_after_drops = _to_int('WS_SLOW_CLIENT_DISCONNECT_AFTER_DROPS', 0)
-        self.coalesce_types: Set[str] = {"page_updated", "song_updated"}
+        # Batch only under load: this many messages go out unbatched first
+        self.ws_batch_after_n_msgs = _to_int('WS_BATCH_AFTER_N_MSGS', 3)
+        self.ws_buffer_threshold_bytes = _to_int('WS_BUFFER_THRESHOLD_BYTES', 8192)
+        # Load the room/song snapshot sent back with join_room_success
+        self.ws_room_state_on_join = os.getenv('WS_VERIFY_ROOM_ON_JOIN', '1') == '1'
+        # room_id -> messages sent unbatched since the last periodic flush
+        self._unbatched_sent: Dict[str, int] = {}
+        self.coalesce_types: frozenset = frozenset({"page_updated", "song_updated"})
+        # Room-level coalescing: one window, one pending dict and one flush
+        # task per room, shared by every member instead of one per connection
+        # loop.time() is the loop's own monotonic clock, cheaper than time.monotonic()
+        self.ws_coalesce_window_s = self.ws_coalesce_window_ms / 1000.0
+        self._room_coalesce: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._room_coalesce_until: Dict[str, float] = {}
+        self._room_coalesce_task: Dict[str, asyncio.Task] = {}
+        # Cleared pending dicts kept for reuse by the next window
+        self._coalesce_dict_pool: List[Dict[str, Dict[str, Any]]] = []
+        # Types that skip batching and coalescing entirely
+        self._non_batchable: frozenset = frozenset({"critical_update", "song_updated", "page_updated"})
 
         # Apply Autobahn protocol options
         try:
@@ -514,7 +598,8 @@ class MusicRoomFactory(WebSocketServerFactory):
         
         self.rooms[room_id].add(protocol.user_id)
         logger.info("WS user joined room", extra={"uid": protocol.user_id, "room_id": room_id})
-        logger.info("WS room member count", extra={"room_id": room_id, "recipient_count": len(self.rooms[room_id])})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("WS room member count", extra={"room_id": room_id, "recipient_count": len(self.rooms[room_id])})
     
     def leave_room(self, protocol: MusicRoomProtocol, room_id: str):
         """Remove a user from a room."""
@@ -525,55 +610,138 @@ class MusicRoomFactory(WebSocketServerFactory):
             # Clean up empty rooms
             if not self.rooms[room_id]:
                 del self.rooms[room_id]
+                self._drop_room_coalesce(room_id)
                 logger.info("WS room removed (empty)", extra={"room_id": room_id})
 
             # Note: Room membership is handled through the REST API
             # Any database updates would be done there to maintain consistency
 
-    async def broadcast_to_room(self, room_id: str, message: Dict[str, Any], exclude=None):
-        """Queue a message to be sent to all users in a room."""
+    def broadcast_to_room(self, room_id: str, message: Dict[str, Any], exclude=None):
+        """Queue a message to be sent to all users in a room.
+
+        Synchronous: encoding and enqueueing never await, so callers invoke it
+        directly instead of wrapping it in a task.
+        """
         if room_id not in self.rooms:
             logger.warning("Attempted to broadcast to non-existent room", extra={"room_id": room_id, "ws_event": message.get('type')})
             return
         
+        msg_type = message.get('type')
+        if msg_type in self.coalesce_types and self.ws_coalesce_window_ms > 0 and exclude is None:
+            self._coalesce_for_room(room_id, msg_type, message)
+            return
+
         # Skip batching for critical message types - send immediately and bypass coalescing
-        immediate_types = ['critical_update', 'song_updated', 'page_updated']
-        
-        if message.get('type') in immediate_types:
+        if msg_type in self._non_batchable:
             # Send immediately without batching or coalescing
             self._send_to_room_users_immediate(room_id, message, exclude)
             return
             
+        # Idle room: send right away instead of waiting for the periodic flush,
+        # until a burst reaches ws_batch_after_n_msgs within one flush interval
+        if not self.message_queues.get(room_id):
+            sent = self._unbatched_sent.get(room_id, 0)
+            if sent < self.ws_batch_after_n_msgs:
+                self._unbatched_sent[room_id] = sent + 1
+                self._send_to_room_users(room_id, _encode(message), message.get('type'), exclude)
+                return
+        
         # Initialize queue if needed
         if room_id not in self.message_queues:
             self.message_queues[room_id] = []
         
         # Queue the message
         self.message_queues[room_id].append(message)
-        logger.debug("WS queued message", extra={"room_id": room_id, "ws_event": message.get('type'), "chunk_count": len(self.message_queues[room_id])})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("WS queued message", extra={"room_id": room_id, "ws_event": message.get('type'), "chunk_count": len(self.message_queues[room_id])})
     
+    def _coalesce_for_room(self, room_id: str, msg_type: str, message: Dict[str, Any]):
+        """Keep only the latest message of each coalescable type per room window.
+
+        The first message on an idle room goes out at once and opens the
+        window; follow-ups inside it replace each other and are sent as one
+        frame, encoded once for all members, when the window closes.
+        """
+        now = self._loop.time()
+        pending = self._room_coalesce.get(room_id)
+        if pending is None:
+            until = self._room_coalesce_until.get(room_id, 0.0)
+            if now >= until:
+                self._room_coalesce_until[room_id] = now + self.ws_coalesce_window_s
+                self._send_to_room_users_immediate(room_id, message)
+                return
+            pool = self._coalesce_dict_pool
+            pending = self._room_coalesce[room_id] = pool.pop() if pool else {}
+            self._room_coalesce_task[room_id] = self._loop.create_task(
+                self._flush_room_coalesced_after(room_id, until - now)
+            )
+        # Re-insert so the flushed frame keeps the order of the latest messages
+        pending.pop(msg_type, None)
+        pending[msg_type] = message
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("WS message coalesced", extra={"room_id": room_id, "ws_event": msg_type})
+
+    async def _flush_room_coalesced_after(self, room_id: str, delay_s: float):
+        try:
+            await asyncio.sleep(delay_s)
+        except asyncio.CancelledError:
+            return
+        self._room_coalesce_task.pop(room_id, None)
+        pending = self._room_coalesce.pop(room_id, None)
+        if pending is None:
+            return
+        # One frame per window: a lone message goes out as-is, several are
+        # wrapped in the same batched_update envelope the periodic flush uses
+        messages = list(pending.values())
+        self._recycle_coalesce_dict(pending)
+        if not messages or room_id not in self.rooms:
+            return
+        if len(messages) == 1:
+            message = messages[0]
+        else:
+            message = {"type": "batched_update", "data": {"messages": messages}}
+        try:
+            self._send_to_room_users_immediate(room_id, message)
+        except Exception:
+            logger.error("WS coalesce flush error", exc_info=True, extra={"room_id": room_id})
+        # The trailing send opens a new window, so a room never gets more
+        # than one coalesced frame per window
+        self._room_coalesce_until[room_id] = self._loop.time() + self.ws_coalesce_window_s
+
+    def _recycle_coalesce_dict(self, pending: Dict[str, Dict[str, Any]]):
+        pending.clear()
+        # Enough for the rooms active at once; extras are left to the GC
+        if len(self._coalesce_dict_pool) < 64:
+            self._coalesce_dict_pool.append(pending)
+
+    def _drop_room_coalesce(self, room_id: str):
+        """Forget coalescing state for a room that no longer exists."""
+        pending = self._room_coalesce.pop(room_id, None)
+        if pending is not None:
+            self._recycle_coalesce_dict(pending)
+        self._room_coalesce_until.pop(room_id, None)
+        task = self._room_coalesce_task.pop(room_id, None)
+        if task is not None:
+            task.cancel()
+
     def _start_periodic_flush(self):
-        """Start the periodic flush task."""
-        loop = asyncio.get_event_loop()
-        loop.call_later(0.2, self._periodic_flush_callback)
+        """Start the periodic flush task on the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._flush_task = self._loop.create_task(self._periodic_flush_loop())
         logger.info("WS periodic flush started")
         
-    def _periodic_flush_callback(self):
-        """Callback for periodic flushing of message queues."""
-        try:
-            # Schedule the next callback first
-            loop = asyncio.get_event_loop()
-            loop.call_later(0.2, self._periodic_flush_callback)
-            
-            # Process all queued messages
-            for room_id in list(self.message_queues.keys()):
-                if self.message_queues.get(room_id, []):
-                    self._flush_message_queue(room_id)
-        except Exception as e:
-            logger.error("WS periodic flush error", exc_info=True)
-            # Ensure the loop continues even if there's an error
-            loop = asyncio.get_event_loop()
-            loop.call_later(1, self._periodic_flush_callback)
+    async def _periodic_flush_loop(self):
+        """Flush queued room messages every 200 ms for the life of the factory."""
+        while True:
+            await asyncio.sleep(0.2)
+            try:
+                self._unbatched_sent.clear()
+                # Process all queued messages
+                for room_id in list(self.message_queues.keys()):
+                    if self.message_queues.get(room_id):
+                        self._flush_message_queue(room_id)
+            except Exception:
+                logger.error("WS periodic flush error", exc_info=True)
     
     def _flush_message_queue(self, room_id: str):
         """Send all queued messages for a room."""
@@ -585,7 +753,8 @@ class MusicRoomFactory(WebSocketServerFactory):
         
         # Don't batch if there's only one message
         if len(messages) == 1:
-            self._send_to_room_users(room_id, messages[0])
+            message = messages[0]
+            self._send_to_room_users(room_id, _encode(message), message.get('type'))
             return
         
         # Batch compatible messages together
@@ -596,48 +765,69 @@ class MusicRoomFactory(WebSocketServerFactory):
             }
         }
         
-        logger.info("WS flush batch", extra={"room_id": room_id, "chunk_count": len(messages)})
-        self._send_to_room_users(room_id, batched_message)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("WS flush batch", extra={"room_id": room_id, "chunk_count": len(messages)})
+        self._send_to_room_users(room_id, _encode(batched_message), "batched_update")
     
-    def _send_to_room_users(self, room_id: str, message: Dict[str, Any], exclude=None):
-        """Send a message to all users in a room (no batching)."""
-        if room_id not in self.rooms:
-            logger.warning("Attempted to send to non-existent room", extra={"room_id": room_id, "ws_event": message.get('type')})
+    def _send_to_room_users(self, room_id: str, encoded: bytes, msg_type: Optional[str], exclude=None):
+        """Queue one pre-encoded message for all users in a room (no batching).
+
+        Only non-coalescable messages come through here, so every recipient
+        shares the same bytes object.
+        """
+        members = self.rooms.get(room_id)
+        if members is None:
+            logger.warning("Attempted to send to non-existent room", extra={"room_id": room_id, "ws_event": msg_type})
             return
+        if not members:
+            return 0
         
+        get_connection = self.connections.get
+        exclude_uid = exclude.user_id if exclude else None
         count = 0
-        for user_id in self.rooms[room_id]:
-            if user_id in self.connections and (not exclude or user_id != exclude.user_id):
-                try:
-                    accepted = self.connections[user_id].enqueue_message(message)
-                    if accepted:
-                        count += 1
-                except Exception:
-                    logger.error("WS enqueue to user failed", exc_info=True, extra={"uid": user_id})
+        # enqueue_bytes never raises, so the loop needs no per-recipient guard
+        for user_id in tuple(members):
+            if user_id == exclude_uid:
+                continue
+            connection = get_connection(user_id)
+            if connection is not None and connection.enqueue_bytes(encoded):
+                count += 1
         
-        logger.debug("WS sent message", extra={"room_id": room_id, "ws_event": message.get('type'), "recipient_count": count})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("WS sent message", extra={"room_id": room_id, "ws_event": msg_type, "recipient_count": count})
         return count
     
     def _send_to_room_users_immediate(self, room_id: str, message: Dict[str, Any], exclude=None):
         """Send a message immediately to all users in a room, bypassing coalescing."""
-        if room_id not in self.rooms:
+        members = self.rooms.get(room_id)
+        if members is None:
             logger.warning("Attempted to send immediate to non-existent room", extra={"room_id": room_id, "ws_event": message.get('type')})
             return
+        if not members:
+            return 0
         
         count = 0
-        encoded_message = json.dumps(message).encode('utf8')
+        encoded_message = _encode(message)
+        get_connection = self.connections.get
+        exclude_uid = exclude.user_id if exclude else None
         
-        for user_id in self.rooms[room_id]:
-            if user_id in self.connections and (not exclude or user_id != exclude.user_id):
-                try:
-                    # Send directly, bypassing the queue and coalescing
-                    connection = self.connections[user_id]
-                    connection.sendMessage(encoded_message)
-                    count += 1
-                except Exception:
-                    logger.error("WS immediate send to user failed", exc_info=True, extra={"uid": user_id})
+        # Iterate a snapshot: a send can trigger onClose -> leave_room, which
+        # mutates the live set
+        for user_id in tuple(members):
+            if user_id == exclude_uid:
+                continue
+            connection = get_connection(user_id)
+            if connection is None:
+                continue
+            try:
+                # Send directly, bypassing the queue and coalescing
+                connection.sendMessage(encoded_message)
+                count += 1
+            except Exception:
+                logger.error("WS immediate send to user failed", exc_info=True, extra={"uid": user_id})
         
-        logger.debug("WS sent immediate message", extra={"room_id": room_id, "ws_event": message.get('type'), "recipient_count": count})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("WS sent immediate message", extra={"room_id": room_id, "ws_event": message.get('type'), "recipient_count": count})
         return count
     
     def register_room(self, room_id: str):
@@ -667,14 +857,15 @@ class MusicRoomFactory(WebSocketServerFactory):
         if song_data.get('image_etag') is not None:
             metadata['image_etag'] = song_data.get('image_etag')
         
-        await self.broadcast_to_room(room_id, {
+        self.broadcast_to_room(room_id, {
             "type": "song_updated",
             "data": metadata
         })
     
     async def broadcast_page_updated(self, room_id: str, page_data: Dict[str, Any]):
         """Send a page update event (metadata only). Clients fetch image over HTTP."""
-        logger.info("WS page_updated broadcast", extra={"room_id": room_id, "page": page_data.get('current_page')})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("WS page_updated broadcast", extra={"room_id": room_id, "page": page_data.get('current_page')})
         
         if room_id not in self.rooms:
             logger.warning("Attempted to send page update to non-existent room", extra={"room_id": room_id, "page": page_data.get('current_page')})
@@ -683,8 +874,9 @@ class MusicRoomFactory(WebSocketServerFactory):
         # Send page metadata without image data
         metadata = page_data.copy()
         
-        logger.info("WS broadcasting page_updated", extra={"room_id": room_id, "recipient_count": len(self.rooms.get(room_id, []))})
-        await self.broadcast_to_room(room_id, {
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("WS broadcasting page_updated", extra={"room_id": room_id, "recipient_count": len(self.rooms.get(room_id, []))})
+        self.broadcast_to_room(room_id, {
             "type": "page_updated",
             "data": metadata
         })
@@ -700,7 +892,7 @@ async def start_websocket_server(host: str = '0.0.0.0', port: int = 8766):
     factory = MusicRoomFactory(f"ws://{host}:{port}")
     factory.protocol = MusicRoomProtocol
     
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     server = await loop.create_server(
         factory, host, port
     )
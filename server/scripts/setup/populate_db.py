@@ -9,7 +9,8 @@ import os
 import sys
 import asyncio
 import argparse
-import io
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Set
 from pathlib import Path
 
@@ -29,7 +30,7 @@ if str(SERVER_DIR) not in sys.path:
 # Import shared utilities and setup environment FIRST
 from scripts.setup.shared_utils import (
     setup_environment, get_data_paths, ensure_directories,
-    read_metadata, parse_chordpro_metadata,
+    read_metadata, save_metadata, parse_chordpro_metadata_cached,
     print_phase_header, print_section_header, ProgressTracker,
     validate_environment
 )
@@ -43,7 +44,32 @@ from scripts.runtime.database import (
     get_database_url, get_engine, get_session_factory
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
+from sqlalchemy import select, text, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# Per-song step-by-step output; failures and the progress line always print
+VERBOSE = False
+
+def vprint(*args, **kwargs):
+    """print() only when --verbose was given"""
+    if VERBOSE:
+        print(*args, **kwargs)
+
+# ============================================================================
+# RENDER POOLS
+# ============================================================================
+
+# Threads for blocking render calls (fallback PDF renderer, page rasterizing),
+# sized for the host rather than the loop's shared default executor
+RENDER_THREADS = int(os.getenv("RENDER_THREADS", str((os.cpu_count() or 1) * 2)))
+_render_threads: Optional[ThreadPoolExecutor] = None
+
+async def run_in_render_thread(func, *args):
+    """Like asyncio.to_thread(), but on the dedicated render thread pool."""
+    global _render_threads
+    if _render_threads is None:
+        _render_threads = ThreadPoolExecutor(max_workers=max(1, RENDER_THREADS), thread_name_prefix="render")
+    return await asyncio.get_running_loop().run_in_executor(_render_threads, func, *args)
 
 # ============================================================================
 # PDF GENERATION
@@ -66,62 +92,76 @@ def render_pdf_from_text(text: str, pdf_path: str) -> int:
 
     max_width = page_width - 2 * margin
     x = margin
-    y = page_height - margin
 
     # Naive wrap by characters
     avg_char_width = 0.6 * font_size
     max_chars_per_line = max(10, int(max_width / avg_char_width))
 
-    def wrap_line(line: str):
-        if len(line) <= max_chars_per_line:
-            return [line]
-        out = []
-        start = 0
-        while start < len(line):
-            out.append(line[start:start + max_chars_per_line])
-            start += max_chars_per_line
-        return out
-
-    page_count = 1
+    # Lay out every line slot up front: each source line becomes its wrapped
+    # segments plus one blank slot, then slots are cut into whole pages
+    slots: List[Optional[str]] = []
     for raw_line in text.splitlines():
-        for seg in wrap_line(raw_line.rstrip("\n")):
-            if y - leading < margin:
-                c.showPage()
-                c.setFont(font_name, font_size)
-                y = page_height - margin
-                page_count += 1
-            c.drawString(x, y, seg)
-            y -= leading
-        if y - leading < margin:
+        slots.extend(
+            raw_line[i:i + max_chars_per_line]
+            for i in range(0, max(len(raw_line), 1), max_chars_per_line)
+        )
+        slots.append(None)
+    lines_per_page = max(1, int((page_height - 2 * margin) // leading))
+    page_count = max(1, -(-len(slots) // lines_per_page))
+
+    draw = c.drawString
+    for start in range(0, len(slots), lines_per_page):
+        if start:
             c.showPage()
             c.setFont(font_name, font_size)
-            y = page_height - margin
-            page_count += 1
-        y -= leading
+        y = page_height - margin
+        for seg in slots[start:start + lines_per_page]:
+            if seg:
+                draw(x, y, seg)
+            y -= leading
 
     c.save()
     return page_count
 
+# ChordPro writes one PDF per invocation only when given a single song (several
+# inputs become one songbook), so runs cannot be batched. Cap how many run at
+# once instead, independently of the song-level --concurrency.
+CHORDPRO_MAX_PROCS = int(os.getenv("CHORDPRO_MAX_PROCS", str(os.cpu_count() or 1)))
+_chordpro_sem: Optional[asyncio.Semaphore] = None
+# Feed the already-read song text on stdin ("-") instead of making ChordPro
+# read the file again. Opt-in: not every ChordPro build accepts "-" as input.
+CHORDPRO_STDIN = os.getenv("CHORDPRO_STDIN", "false").lower() in ("1", "true", "yes", "on")
+
+def _get_chordpro_sem() -> asyncio.Semaphore:
+    global _chordpro_sem
+    if _chordpro_sem is None:
+        _chordpro_sem = asyncio.Semaphore(max(1, CHORDPRO_MAX_PROCS))
+    return _chordpro_sem
+
 async def render_pdf_with_chordpro_or_fallback(cho_path: str, pdf_path: str, content: str) -> int:
     """Try rendering via ChordPro (CHORDPRO_PATH). Fallback to simple renderer."""
     exe = os.getenv("CHORDPRO_PATH")
     song_name = os.path.basename(cho_path)
     
     if exe and os.path.exists(exe):
-        print(f"Using ChordPro to render PDF...", end=" ")
+        vprint(f"Using ChordPro to render PDF...", end=" ")
         os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
         try:
-            proc = await asyncio.create_subprocess_exec(
-                exe, "-o", pdf_path, cho_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            out, err = await proc.communicate()
+            async with _get_chordpro_sem():
+                proc = await asyncio.create_subprocess_exec(
+                    exe, "-o", pdf_path, "-" if CHORDPRO_STDIN else cho_path,
+                    stdin=asyncio.subprocess.PIPE if CHORDPRO_STDIN else None,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                out, err = await proc.communicate(
+                    content.encode("utf-8") if CHORDPRO_STDIN else None
+                )
             if proc.returncode == 0 and os.path.exists(pdf_path):
                 try:
                     with fitz.open(pdf_path) as doc:
                         page_count = doc.page_count
-                        print(f"({page_count} pages)")
+                        vprint(f"({page_count} pages)")
                         return page_count
                 except Exception as e:
                     print(f"PDF validation failed: {e}")
@@ -135,14 +175,14 @@ async def render_pdf_with_chordpro_or_fallback(cho_path: str, pdf_path: str, con
             print(f"Falling back to simple renderer...")
     else:
         if exe:
-            print(f"ChordPro not found at {exe}, using fallback renderer...", end=" ")
+            vprint(f"ChordPro not found at {exe}, using fallback renderer...", end=" ")
         else:
-            print(f"Using simple text renderer...", end=" ")
+            vprint(f"Using simple text renderer...", end=" ")
     
     # Fallback renderer
     try:
-        page_count = await asyncio.to_thread(render_pdf_from_text, content, pdf_path)
-        print(f"({page_count} pages)")
+        page_count = await run_in_render_thread(render_pdf_from_text, content, pdf_path)
+        vprint(f"({page_count} pages)")
         return page_count
     except Exception as e:
         print(f"Fallback renderer failed: {e}")
@@ -152,23 +192,108 @@ async def render_pdf_with_chordpro_or_fallback(cho_path: str, pdf_path: str, con
 # IMAGE GENERATION
 # ============================================================================
 
+# libwebp effort level, 0 (fastest) to 6 (smallest). PIL's default of 4 makes
+# encoding the slowest step of the pipeline for little size gain on
+# text-only song sheets.
+WEBP_METHOD = int(os.getenv("WEBP_METHOD", "0"))
+
+# Written into a song's image directory once all its pages are encoded;
+# holds the page count. A single stat() then tells a rerun the set is complete.
+IMAGES_DONE_MARKER = ".done"
+
+# Pages are rendered at `scale` but never wider than this many pixels, so
+# oversized page formats do not blow up pixel count and encode time
+WEBP_TARGET_WIDTH_PX = int(os.getenv("WEBP_TARGET_WIDTH_PX", "1400"))
+
+# Worker processes for WebP encoding; 0 or 1 encodes inline
+WEBP_WORKERS = int(os.getenv("WEBP_WORKERS", str(os.cpu_count() or 1)))
+_webp_pool: Optional[ProcessPoolExecutor] = None
+_webp_pool_lock = threading.Lock()
+
+def _get_webp_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared WebP encoding pool, creating it on first use.
+
+    populate_database() calls this on the loop thread before any render
+    thread starts, so workers are forked while no thread is inside fitz; the
+    lock keeps any later concurrent callers down to a single pool.
+    """
+    global _webp_pool
+    if WEBP_WORKERS <= 1:
+        return None
+    if _webp_pool is None:
+        with _webp_pool_lock:
+            if _webp_pool is None:
+                _webp_pool = ProcessPoolExecutor(max_workers=WEBP_WORKERS)
+    return _webp_pool
+
+def shutdown_render_pools():
+    """Stop the render threads and WebP encoding workers, if any were started."""
+    global _webp_pool, _render_threads
+    if _render_threads is not None:
+        _render_threads.shutdown()
+        _render_threads = None
+    if _webp_pool is not None:
+        _webp_pool.shutdown()
+        _webp_pool = None
+
+def _encode_webp_page(out_path: str, width: int, height: int, stride: int,
+                      samples, quality: int, method: int):
+    """Encode one rasterized RGB page to WebP (runs in a worker process)."""
+    # Wrap the raw RGB samples directly; no PNG encode/decode round-trip
+    img = Image.frombuffer("RGB", (width, height), samples, "raw", "RGB", stride, 1)
+    img.save(out_path, format="WEBP", quality=quality, method=method, lossless=False)
+
 def render_webp_from_pdf(pdf_path: str, out_dir: str, scale: float = 2.0, quality: int = 80):
     """Generate WebP images from PDF pages"""
     os.makedirs(out_dir, exist_ok=True)
     
     try:
+        # Rasterize here (PyMuPDF is not safe to use across processes) and
+        # fan the CPU-heavy WebP encoding out to the process pool
+        pool = _get_webp_pool()
+        futures = []
         with fitz.open(pdf_path) as doc:
             page_count = doc.page_count
-            print(f"Generating {page_count} WebP images...", end=" ")
+            vprint(f"Generating {page_count} WebP images...", end=" ")
             
+            # Pages of one PDF nearly always share a size; one matrix per width
+            matrices: Dict[float, "fitz.Matrix"] = {}
+            pdf_mtime = os.path.getmtime(pdf_path)
             for i, page in enumerate(doc, start=1):
-                mat = fitz.Matrix(scale, scale)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                img = Image.open(io.BytesIO(pix.tobytes("png")))
                 out_path = os.path.join(out_dir, f"page_{i}.webp")
-                img.save(out_path, format="WEBP", quality=quality)
-            
-            print(f"done")
+                # A page encoded after the PDF was last written is still current
+                try:
+                    if os.path.getmtime(out_path) >= pdf_mtime:
+                        continue
+                except OSError:
+                    pass
+                width = page.rect.width
+                mat = matrices.get(width)
+                if mat is None:
+                    page_scale = min(scale, WEBP_TARGET_WIDTH_PX / width) if width > 0 else scale
+                    mat = matrices[width] = fitz.Matrix(page_scale, page_scale)
+                pix = page.get_pixmap(matrix=mat, alpha=False)
+                if pool is None:
+                    # samples_mv is a zero-copy view of the pixmap's own buffer
+                    _encode_webp_page(out_path, pix.width, pix.height, pix.stride,
+                                      pix.samples_mv, quality, WEBP_METHOD)
+                else:
+                    # Worker processes need a picklable copy
+                    futures.append(pool.submit(
+                        _encode_webp_page, out_path, pix.width, pix.height, pix.stride,
+                        pix.samples, quality, WEBP_METHOD,
+                    ))
+        
+        for fut in futures:
+            fut.result()
+        
+        # Atomic write so an interrupted run never leaves a marker behind
+        done_path = os.path.join(out_dir, IMAGES_DONE_MARKER)
+        tmp_path = f"{done_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(page_count))
+        os.replace(tmp_path, done_path)
+        vprint(f"done")
             
     except Exception as e:
         print(f"Image generation failed: {e}")
@@ -209,10 +334,14 @@ async def setup_search_infrastructure() -> bool:
         idx_title = "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_songs_title_trgm ON songs USING gin (title gin_trgm_ops);"
         idx_artist = "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_songs_artist_trgm ON songs USING gin (artist gin_trgm_ops);"
         idx_title_btree = "CREATE INDEX IF NOT EXISTS idx_songs_title_btree ON songs (title);"  # Non-concurrent for transaction phase
+        idx_title_lower = "CREATE INDEX IF NOT EXISTS idx_songs_title_lower_pattern ON songs (lower(title) text_pattern_ops);"
+        idx_artist_lower = "CREATE INDEX IF NOT EXISTS idx_songs_artist_lower_pattern ON songs (lower(artist) text_pattern_ops);"
     else:
         idx_title = "CREATE INDEX IF NOT EXISTS idx_songs_title_trgm ON songs USING gin (title gin_trgm_ops);"
         idx_artist = "CREATE INDEX IF NOT EXISTS idx_songs_artist_trgm ON songs USING gin (artist gin_trgm_ops);"
         idx_title_btree = "CREATE INDEX IF NOT EXISTS idx_songs_title_btree ON songs (title);"
+        idx_title_lower = "CREATE INDEX IF NOT EXISTS idx_songs_title_lower_pattern ON songs (lower(title) text_pattern_ops);"
+        idx_artist_lower = "CREATE INDEX IF NOT EXISTS idx_songs_artist_lower_pattern ON songs (lower(artist) text_pattern_ops);"
     
     # FTS statements
     fts_statements = []
@@ -248,81 +377,76 @@ async def setup_search_infrastructure() -> bool:
                 except Exception as e:
                     print(f"not done {e}")
                     return False
-                
-                # Create B-tree index (non-concurrent)
-                print(f"   Creating B-tree indexes...")
-                print(f"      - title B-tree index...", end=" ")
-                try:
-                    await conn.execute(text(idx_title_btree))
-                    print("done")
-                except Exception as e:
-                    if "already exists" in str(e).lower():
-                        print("done (exists)")
-                    else:
-                        print(f"not done {e}")
-                
-                # Create FTS infrastructure (non-concurrent)
-                if fts_statements:
-                    print(f"   🔍 Setting up full-text search ({fts_mode} mode)...")
-                    for stmt in fts_statements:
-                        if "CONCURRENTLY" in stmt:
-                            continue  # Skip concurrent statements for later
-                        
-                        if stmt.startswith("ALTER TABLE"):
-                            print(f"      - Adding tsvector column...", end=" ")
-                        elif "fts_expr" in stmt:
-                            print(f"      - Creating expression index...", end=" ")
-                        else:
-                            print(f"      - Executing FTS statement...", end=" ")
-                        
+
+            ddl_jobs = [
+                (idx_title_btree, "title B-tree index"),
+                (idx_title_lower, "lower(title) prefix index"),
+                (idx_artist_lower, "lower(artist) prefix index"),
+            ]
+            for stmt in fts_statements:
+                if "CONCURRENTLY" in stmt:
+                    continue  # Skip concurrent statements for later
+                if stmt.startswith("ALTER TABLE"):
+                    ddl_jobs.append((stmt, "tsvector column"))
+                elif "fts_expr" in stmt:
+                    ddl_jobs.append((stmt, "FTS expression index"))
+                else:
+                    ddl_jobs.append((stmt, "FTS statement"))
+
+            # Every statement is IF NOT EXISTS, so send them as one
+            # multi-statement string in a single round-trip. asyncpg only
+            # accepts that through its simple-query execute(), hence the raw
+            # connection.
+            print(f"   Creating {len(ddl_jobs)} B-tree/FTS objects in one batch...", end=" ")
+            try:
+                async with engine.begin() as conn:
+                    raw = await conn.get_raw_connection()
+                    await raw.driver_connection.execute("\n".join(stmt for stmt, _ in ddl_jobs))
+                print("done")
+            except Exception as e:
+                # Fall back to one statement at a time to see which one failed
+                print(f"not done {e}")
+                async with engine.begin() as conn:
+                    for stmt, desc in ddl_jobs:
+                        print(f"      - {desc}...", end=" ")
                         try:
-                            await conn.execute(text(stmt))
+                            async with conn.begin_nested():
+                                await conn.execute(text(stmt))
                             print("done")
                         except Exception as e:
                             if "already exists" in str(e).lower():
                                 print("done (exists)")
                             else:
                                 print(f"not done {e}")
-            
-            # Now create CONCURRENT indexes outside transaction
-            async with engine.connect() as conn:
-                # Use execution_options for autocommit mode
-                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
-                
-                print(f"   Creating concurrent trigram indexes...")
-                for stmt, desc in [
-                    (idx_title, "title trigram index"),
-                    (idx_artist, "artist trigram index"),
-                ]:
-                    print(f"      - {desc}...", end=" ")
+
+            # Now create CONCURRENT indexes outside transaction. Each build
+            # gets its own autocommit connection so they run side by side.
+            async def run_one(stmt: str, desc: str):
+                async with engine.connect() as conn:
+                    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
                     try:
                         await conn.execute(text(stmt))
-                        print("done")
+                        print(f"      - {desc}... done")
                     except Exception as e:
                         if "already exists" in str(e).lower():
-                            print("done (exists)")
-                        else:
-                            print(f"not done {e}")
-                
-                # Create concurrent FTS indexes
-                if fts_statements:
-                    for stmt in fts_statements:
-                        if "CONCURRENTLY" not in stmt:
-                            continue  # Already handled above
-                        
-                        if "ts_gin" in stmt:
-                            print(f"      - Creating concurrent tsvector index...", end=" ")
+                            print(f"      - {desc}... done (exists)")
                         else:
-                            print(f"      - Creating concurrent FTS index...", end=" ")
-                        
-                        try:
-                            await conn.execute(text(stmt))
-                            print("done")
-                        except Exception as e:
-                            if "already exists" in str(e).lower():
-                                print("done (exists)")
-                            else:
-                                print(f"not done {e}")
+                            print(f"      - {desc}... not done {e}")
+            
+            concurrent_jobs = [
+                (idx_title, "title trigram index"),
+                (idx_artist, "artist trigram index"),
+            ]
+            for stmt in fts_statements:
+                if "CONCURRENTLY" not in stmt:
+                    continue  # Already handled above
+                if "ts_gin" in stmt:
+                    concurrent_jobs.append((stmt, "concurrent tsvector index"))
+                else:
+                    concurrent_jobs.append((stmt, "concurrent FTS index"))
+            
+            print(f"   Creating {len(concurrent_jobs)} concurrent indexes in parallel...")
+            await asyncio.gather(*(run_one(stmt, desc) for stmt, desc in concurrent_jobs))
             
             print("Search infrastructure setup completed")
             return True
@@ -343,13 +467,22 @@ async def setup_search_infrastructure() -> bool:
 # DATABASE OPERATIONS
 # ============================================================================
 
+async def load_page_counts(session: AsyncSession) -> Dict[str, int]:
+    """Return {song_id: page_count} for every song already in the database"""
+    res = await session.execute(select(Song.id, Song.page_count))
+    return {song_id: page_count for song_id, page_count in res.all()}
+
 async def reset_songs_table(session: AsyncSession):
     """Clear only the songs table; do not touch room-related tables."""
     await session.execute(select(Song))  # ensure table exists via metadata linkage
     await session.execute(text("DELETE FROM songs"))
 
+# Rows per INSERT ... ON CONFLICT statement (9 bind params each, well under
+# the PostgreSQL limit of 32767 per statement)
+SONG_UPSERT_BATCH = 500
+
 async def upsert_song(
-    session: AsyncSession,
+    pending_rows: List[dict],
     song_id: str,
     *,
     title: str,
@@ -361,52 +494,94 @@ async def upsert_song(
     genre: Optional[str] = None,
     language: Optional[str] = None,
 ):
-    """Upsert song into database"""
+    """Queue a song row for flush_song_upserts()"""
+    pending_rows.append({
+        "id": song_id,
+        "title": title,
+        "artist": artist,
+        "filename": filename,
+        "page_count": page_count,
+        "key": key,
+        "tempo": tempo,
+        "genre": genre,
+        "language": language,
+    })
+
+async def flush_song_upserts(session: AsyncSession, pending_rows: List[dict]):
+    """Upsert queued song rows with one INSERT ... ON CONFLICT per batch"""
+    table = Song.__table__
     try:
-        res = await session.execute(select(Song).where(Song.id == song_id))
-        existing = res.scalars().first()
-        if existing:
-            # Update existing song
-            existing.title = title
-            existing.artist = artist
-            existing.filename = filename
-            existing.page_count = page_count
-            existing.key = key
-            existing.tempo = tempo
-            existing.genre = genre
-            if language:
-                existing.language = language
-        else:
-            # Insert new song
-            obj = Song(
-                id=song_id,
-                title=title,
-                artist=artist,
-                filename=filename,
-                page_count=page_count,
-                key=key,
-                tempo=tempo,
-                genre=genre,
-                language=language,
+        for start in range(0, len(pending_rows), SONG_UPSERT_BATCH):
+            stmt = pg_insert(table).values(pending_rows[start:start + SONG_UPSERT_BATCH])
+            excluded = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={
+                    "title": excluded.title,
+                    "artist": excluded.artist,
+                    "filename": excluded.filename,
+                    "page_count": excluded.page_count,
+                    "key": excluded.key,
+                    "tempo": excluded.tempo,
+                    "genre": excluded.genre,
+                    # A song without a language tag keeps the stored one
+                    "language": func.coalesce(excluded.language, table.c.language),
+                },
             )
-            session.add(obj)
+            await session.execute(stmt)
     except Exception as e:
         print(f"Database upsert error: {e}")
         raise
 
+SONG_COPY_COLUMNS = ["id", "title", "artist", "filename", "page_count", "key", "tempo", "genre", "language"]
+
+async def check_copy_defaults(session: AsyncSession):
+    """Fail before COPY if songs.date_added has no server default.
+
+    COPY leaves out date_added, so without the default (added by the
+    server's schema upgrade) every row would get NULL.
+    """
+    res = await session.execute(text(
+        "SELECT column_default FROM information_schema.columns "
+        "WHERE table_name = 'songs' AND column_name = 'date_added'"
+    ))
+    if res.scalar() is None:
+        raise RuntimeError(
+            "songs.date_added has no default; start the server once to apply "
+            "schema upgrades, or run without --reset-songs"
+        )
+
+def song_copy_records(pending_rows: List[dict]) -> List[tuple]:
+    """Turn upsert_song() rows into COPY records in SONG_COPY_COLUMNS order"""
+    return [tuple(row[c] for c in SONG_COPY_COLUMNS) for row in pending_rows]
+
+async def copy_songs(session: AsyncSession, pending_rows: List[dict]):
+    """Bulk-load queued rows with COPY; only valid right after --reset-songs emptied the table"""
+    if not pending_rows:
+        return
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    # date_added comes from the column's server default
+    records = song_copy_records(pending_rows)
+    await raw.driver_connection.copy_records_to_table(
+        Song.__tablename__, records=records, columns=SONG_COPY_COLUMNS
+    )
+
 # ============================================================================
 # SONG PROCESSING
 # ============================================================================
 
 async def process_one_song(
-    session: AsyncSession, 
+    pending_rows: List[dict], 
     song_id: str, 
     filename: str, 
     paths: Dict[str, str],
-    regen_assets: bool = False
+    regen_assets: bool = False,
+    known_page_counts: Optional[Dict[str, int]] = None,
+    md_cache: Optional[Dict[str, dict]] = None
 ) -> Tuple[str, bool]:
-    """Process a single song: generate PDF, images, and update database"""
-    print(f"Processing song {song_id}: {filename}")
+    """Process a single song: generate PDF and images, and queue its database row"""
+    vprint(f"Processing song {song_id}: {filename}")
     
     cho_path = os.path.join(paths['songs_dir'], filename)
     if not os.path.exists(cho_path):
@@ -414,20 +589,20 @@ async def process_one_song(
         return song_id, False
 
     # Parse metadata
-    print(f"Parsing ChordPro metadata...", end=" ")
+    vprint(f"Parsing ChordPro metadata...", end=" ")
     default_title = os.path.splitext(filename)[0]
-    md = parse_chordpro_metadata(cho_path, default_title)
+    md = parse_chordpro_metadata_cached(cho_path, default_title, md_cache if md_cache is not None else {})
     title = md.get("title") or default_title
     artist = md.get("artist")
     key_meta = md.get("key")
     tempo_meta = md.get("tempo")
     genre_meta = md.get("genre")
     language_meta = md.get("language")
-    print(f"done")
-    print(f"Title: {title}")
-    print(f"Artist: {artist}")
+    vprint(f"done")
+    vprint(f"Title: {title}")
+    vprint(f"Artist: {artist}")
     if key_meta:
-        print(f"Key: {key_meta}")
+        vprint(f"Key: {key_meta}")
 
     # Setup paths
     pdf_path = os.path.join(paths['songs_pdf_dir'], f"{song_id}.pdf")
@@ -436,15 +611,15 @@ async def process_one_song(
     # Check if PDF generation is needed
     need_pdf = regen_assets or not os.path.exists(pdf_path)
     if need_pdf:
-        print(f"PDF generation needed")
+        vprint(f"PDF generation needed")
     else:
-        print(f"PDF exists, checking validity...", end=" ")
+        vprint(f"PDF exists, checking validity...", end=" ")
 
     # Read ChordPro content
     try:
         with open(cho_path, "r", encoding="utf-8", errors="ignore") as f:
             content = f.read()
-        print(f"ChordPro content loaded ({len(content)} chars)")
+        vprint(f"ChordPro content loaded ({len(content)} chars)")
     except Exception as e:
         print(f"Failed to read ChordPro file: {e}")
         return song_id, False
@@ -457,11 +632,15 @@ async def process_one_song(
         except Exception as e:
             print(f"PDF generation failed: {e}")
             return song_id, False
+    elif known_page_counts and known_page_counts.get(song_id):
+        # Already recorded by a previous run; no need to parse the PDF again
+        page_count = known_page_counts[song_id]
+        vprint(f"({page_count} pages, from database)")
     else:
         try:
             with fitz.open(pdf_path) as doc:
                 page_count = doc.page_count
-                print(f"({page_count} pages)")
+                vprint(f"({page_count} pages)")
         except Exception as e:
             print(f"Invalid, regenerating...")
             try:
@@ -470,33 +649,24 @@ async def process_one_song(
                 print(f"PDF regeneration failed: {e2}")
                 return song_id, False
 
-    # Generate or validate WebP images
-    need_images = regen_assets or not (os.path.isdir(img_dir) and 
-                                      any(fn.endswith('.webp') for fn in os.listdir(img_dir)))
+    # Generate WebP images unless a previous run completed them
+    done_path = os.path.join(img_dir, IMAGES_DONE_MARKER)
+    need_images = regen_assets or not os.path.exists(done_path)
     if need_images:
-        print(f"Image generation needed")
+        vprint(f"Image generation needed")
         try:
-            await asyncio.to_thread(render_webp_from_pdf, pdf_path, img_dir)
+            await run_in_render_thread(render_webp_from_pdf, pdf_path, img_dir)
         except Exception as e:
             print(f"Image generation failed: {e}")
             return song_id, False
     else:
-        try:
-            existing_images = [f for f in os.listdir(img_dir) if f.endswith('.webp')]
-            print(f"Images exist ({len(existing_images)} files) done")
-        except Exception:
-            print(f"Image directory issue, regenerating...")
-            try:
-                await asyncio.to_thread(render_webp_from_pdf, pdf_path, img_dir)
-            except Exception as e:
-                print(f"Image generation failed: {e}")
-                return song_id, False
+        vprint(f"Images exist done")
 
-    # Save to database
-    print(f"Saving to database...", end=" ")
+    # Queue for the batched database upsert
+    vprint(f"Queueing database row...", end=" ")
     try:
         await upsert_song(
-            session,
+            pending_rows,
             song_id,
             title=title,
             artist=artist,
@@ -507,8 +677,8 @@ async def process_one_song(
             genre=genre_meta,
             language=language_meta,
         )
-        print("done")
-        print(f"Song {song_id} completed successfully")
+        vprint("done")
+        vprint(f"Song {song_id} completed successfully")
         return song_id, True
     except Exception as e:
         print(f"Database error: {e}")
@@ -566,38 +736,77 @@ async def populate_database(paths: Dict[str, str], args) -> int:
             # Reset database if requested
             if args.reset_songs:
                 print(f"🗑️  Clearing songs table...")
+                await check_copy_defaults(session)
                 await reset_songs_table(session)
                 await session.commit()
                 print(f"✅ Songs table cleared")
             
+            known_page_counts = {} if args.regen_assets else await load_page_counts(session)
+            # Parsed ChordPro tags from earlier runs, keyed by .cho filename
+            md_cache = read_metadata(paths['chordpro_meta_cache_path'])
+            
             # Process songs
             items = sorted(metadata.items(), key=lambda kv: int(kv[0]) if kv[0].isdigit() else kv[0])
-            sem = asyncio.Semaphore(max(1, args.concurrency))
             
             print_section_header(f"🚀 Processing {len(items)} songs")
             
             progress = ProgressTracker(len(items), "songs")
+            # Start the WebP encoders before any render thread exists
+            _get_webp_pool()
+            # Workers share one event loop, so appends need no lock
+            pending_rows: List[dict] = []
+            write_errors: List[Exception] = []
             
-            async def worker(song_id: str, filename: str):
-                async with sem:
+            async def write_rows(rows: List[dict]):
+                # Each batch gets its own session and connection, so a worker
+                # writing a full batch does not hold up the others
+                async with AsyncSessionLocal() as worker_session:
+                    if args.reset_songs:
+                        # Table was just emptied: every row is new, so one
+                        # binary COPY replaces the INSERT ... ON CONFLICT
+                        await copy_songs(worker_session, rows)
+                    else:
+                        await flush_song_upserts(worker_session, rows)
+                    await worker_session.commit()
+            
+            async def process_and_flush(song_id: str, filename: str):
+                try:
+                    _, ok = await process_one_song(
+                        pending_rows, song_id, filename, paths, 
+                        regen_assets=args.regen_assets,
+                        known_page_counts=known_page_counts,
+                        md_cache=md_cache
+                    )
+                    progress.update(ok, f"Song {song_id}")
+                except Exception as e:
+                    print(f"Failed processing {song_id}:{filename} -> {e}")
+                    progress.update(False, f"Song {song_id}")
+                    return
+                if len(pending_rows) >= SONG_UPSERT_BATCH:
+                    batch = pending_rows[:]
+                    pending_rows.clear()
                     try:
-                        _, ok = await process_one_song(
-                            session, song_id, filename, paths, 
-                            regen_assets=args.regen_assets
-                        )
-                        progress.update(ok, f"Song {song_id}")
-                        return ok
+                        await write_rows(batch)
                     except Exception as e:
-                        print(f"Failed processing {song_id}:{filename} -> {e}")
-                        progress.update(False, f"Song {song_id}")
-                        return False
-
-            tasks = [asyncio.create_task(worker(sid, fn)) for sid, fn in items]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+                        write_errors.append(e)
             
-            # Commit all changes
-            print(f"\n💾 Committing to database...", end=" ")
-            await session.commit()
+            # A fixed pool of workers pulls from one shared iterator, so only
+            # `concurrency` tasks exist however large the catalog is
+            pending_items = iter(items)
+            
+            async def worker():
+                for song_id, filename in pending_items:
+                    await process_and_flush(song_id, filename)
+
+            workers = max(1, min(args.concurrency, len(items)))
+            await asyncio.gather(*(worker() for _ in range(workers)))
+            if write_errors:
+                raise write_errors[0]
+            save_metadata(md_cache, paths['chordpro_meta_cache_path'])
+            
+            # Write the remaining rows
+            print(f"\n💾 Committing {len(pending_rows)} songs to database...", end=" ")
+            await write_rows(pending_rows)
             print(f"✅")
             
             # Summary
@@ -642,8 +851,12 @@ async def main(argv=None):
     parser.add_argument("--skip-search", action="store_true", help="Skip search infrastructure setup")
     parser.add_argument("--blocking-indexes", action="store_true", help="Use blocking index creation (faster but locks tables)")
     parser.add_argument("--fts-mode", choices=["none", "expr", "column"], help="Full-text search mode")
+    parser.add_argument("--verbose", action="store_true", help="Print every processing step for each song")
     args = parser.parse_args(argv)
 
+    global VERBOSE
+    VERBOSE = args.verbose
+
     print("DATABASE POPULATION")
     print("=" * 60)
     
@@ -711,6 +924,8 @@ async def main(argv=None):
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        shutdown_render_pools()
 
 if __name__ == "__main__":
     try:
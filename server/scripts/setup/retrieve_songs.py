@@ -7,13 +7,25 @@ No database operations or asset generation.
 
 import os
 import sys
+import time
 import asyncio
 import argparse
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple, Union
 from pathlib import Path
+from urllib.parse import quote
 
 # Third-party imports
 import httpx
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # Add server directory to path
 SCRIPT_DIR = Path(__file__).parent
@@ -30,129 +42,437 @@ from scripts.setup.shared_utils import (
 )
 
 # GitHub configuration
-GITHUB_API_URL = "https://api.github.com/repos/hopekcc/song-db-chordpro/contents/"
+GITHUB_OWNER = "hopekcc"
+GITHUB_REPO = "song-db-chordpro"
+# Any ref works; HEAD follows the repository's default branch
+GITHUB_BRANCH = os.getenv("GITHUB_BRANCH", "HEAD")
+GITHUB_API_URL = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/"
+GITHUB_TREE_URL = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/git/trees/{GITHUB_BRANCH}"
+GITHUB_RAW_URL = f"https://raw.githubusercontent.com/{GITHUB_OWNER}/{GITHUB_REPO}/{GITHUB_BRANCH}/"
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+# Page size for Contents API listings (GitHub maximum is 100)
+GITHUB_PER_PAGE = int(os.getenv("GITHUB_PER_PAGE", "100"))
+# Bytes per streamed download chunk
+DOWNLOAD_CHUNK_SIZE = 65536
+# Connection pool shared by the listing and all downloads
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+# Concurrent raw downloads; raw.githubusercontent.com is outside the REST quota
+DOWNLOAD_CONCURRENCY = int(os.getenv("DOWNLOAD_CONCURRENCY", "20"))
+# Upper bound for concurrent REST API requests when authenticated
+API_MAX_CONCURRENCY = 50
+# Rate-limited requests are retried this many times, waiting at most
+# RATE_LIMIT_MAX_WAIT seconds each; longer waits count as failures
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_MAX_WAIT = 120.0
+
+# Last X-RateLimit-Remaining seen from the REST API
+api_rate_remaining: Optional[int] = None
 
 # ============================================================================
 # GITHUB API OPERATIONS
 # ============================================================================
 
-async def fetch_song_list_from_github() -> List[dict]:
-    """Fetch complete list of .cho files from GitHub repository"""
-    print_phase_header("GITHUB REPOSITORY SCAN")
-    print(f"GitHub API URL: {GITHUB_API_URL}")
-    
+def parse_json(response: httpx.Response):
+    """Decode a JSON response body, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def make_client() -> httpx.AsyncClient:
+    """One pooled client for api.github.com and raw.githubusercontent.com.
+
+    It carries no credentials; API requests add api_headers() themselves so
+    the token is never sent with raw downloads.
+    """
+    return httpx.AsyncClient(http2=HTTP2_AVAILABLE, timeout=30.0, limits=HTTP_LIMITS)
+
+def api_headers() -> Dict[str, str]:
+    """Headers for GitHub REST API requests"""
     headers = {"Accept": "application/vnd.github+json"}
     if GITHUB_TOKEN:
         headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+    return headers
+
+class ListingNotModified(Exception):
+    """GitHub answered 304: the tree matches the stored ETag"""
+
+class RateLimited(Exception):
+    """A download was throttled; `delay` is how long to wait before retrying"""
+    def __init__(self, delay: float):
+        super().__init__(f"rate limited, retry in {delay:.0f}s")
+        self.delay = delay
+
+def retry_delay(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait before retrying a rate-limited response, else None"""
+    if response.status_code not in (403, 429):
+        return None
+    headers = response.headers
+    if headers.get("Retry-After"):
+        try:
+            delay = float(headers["Retry-After"])
+        except ValueError:
+            return None
+    elif headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset"):
+        delay = int(headers["X-RateLimit-Reset"]) - time.time()
+    elif response.status_code == 429:
+        delay = 60.0  # GitHub's advice when no header says otherwise
+    else:
+        return None  # A plain 403 is not a rate limit
+    if delay > RATE_LIMIT_MAX_WAIT:
+        return None
+    return max(delay, 1.0)
+
+def api_concurrency() -> int:
+    """Concurrent REST requests the remaining quota allows"""
+    if not GITHUB_TOKEN:
+        return 1  # 60 requests/hour anonymously
+    if api_rate_remaining is None:
+        return 10
+    return max(1, min(API_MAX_CONCURRENCY, api_rate_remaining // 2))
+
+async def api_get(client: httpx.AsyncClient, url: Union[str, httpx.URL], **kwargs) -> httpx.Response:
+    """GET a REST API URL, waiting out rate limits and tracking the quota"""
+    global api_rate_remaining
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        response = await client.get(url, **kwargs)
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            api_rate_remaining = int(remaining)
+        delay = retry_delay(response)
+        if delay is None or attempt == RATE_LIMIT_RETRIES:
+            return response
+        print(f"GitHub rate limit hit, retrying in {delay:.0f}s...")
+        await asyncio.sleep(delay)
+    return response
+
+def raw_url(path: str) -> str:
+    """raw.githubusercontent.com URL for a repository path at GITHUB_BRANCH"""
+    return GITHUB_RAW_URL + quote(path)
+
+async def fetch_tree(client: httpx.AsyncClient,
+                     etag: Optional[str] = None) -> Tuple[Optional[List[dict]], Optional[str]]:
+    """List every .cho file with one recursive Git Trees API call.
+
+    Entries are shaped like Contents API file items (name, path, type,
+    download_url). Returns (files, etag); files is None when GitHub
+    truncates the tree, in which case the caller falls back to walking
+    directories. Raises ListingNotModified when `etag` still matches.
+    """
+    print("Fetching recursive repository tree...")
+    headers = api_headers()
+    if etag:
+        headers["If-None-Match"] = etag
+    response = await api_get(client, GITHUB_TREE_URL, params={"recursive": "1"}, headers=headers)
+    if response.status_code == 304:
+        raise ListingNotModified()
+    response.raise_for_status()
+    new_etag = response.headers.get("ETag")
+    payload = parse_json(response)
+    if payload.get("truncated"):
+        print("Tree listing truncated by GitHub, walking directories instead")
+        return None, new_etag
+
+    cho_files = []
+    for entry in payload.get("tree", []):
+        path = entry.get("path", "")
+        if entry.get("type") != "blob" or not path.endswith(".cho"):
+            continue
+        cho_files.append({
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "type": "file",
+            "download_url": raw_url(path),
+        })
+    print(f"Tree fetched ({len(cho_files)} .cho files)")
+    return cho_files, new_etag
+
+async def paginated_get(client: httpx.AsyncClient, url: str, params: Optional[dict] = None) -> List[dict]:
+    """GET a GitHub list endpoint, following Link: rel="next" until exhausted"""
+    items: List[dict] = []
+    headers = api_headers()
+    # httpx's params= replaces the URL's query string, which would drop the
+    # ?ref= that GitHub puts on subdirectory URLs; merge into the URL instead
+    first_url = httpx.URL(url).copy_merge_params({"per_page": GITHUB_PER_PAGE, **(params or {})})
+    response = await api_get(client, first_url, headers=headers)
+    while True:
+        response.raise_for_status()
+        items.extend(parse_json(response))
+        next_link = response.links.get("next")
+        if not next_link:
+            return items
+        # The next URL already carries per_page and page
+        response = await api_get(client, next_link["url"], headers=headers)
+
+async def walk_contents(client: httpx.AsyncClient) -> List[dict]:
+    """List .cho files in the root and first-level directories via the Contents API"""
+    all_cho_files: List[dict] = []
+
+    print("Fetching root directory contents...")
+    # List the same ref raw_url() downloads from; subdirectory URLs in the
+    # response carry it on as ?ref=
+    root_contents = await paginated_get(client, GITHUB_API_URL, {"ref": GITHUB_BRANCH})
+    print(f"Root directory fetched ({len(root_contents)} items)")
+
+    # Process root directory files
+    root_cho = [item for item in root_contents
+               if item.get("type") == "file" and item.get("name", "").endswith(".cho")]
+    all_cho_files.extend(root_cho)
+    print(f"Found {len(root_cho)} .cho files in root directory")
+
+    # Process subdirectories
+    subdirectories = [item for item in root_contents if item.get("type") == "dir"]
+    print(f"Found {len(subdirectories)} subdirectories to scan...")
+
+    if subdirectories:
+        print_section_header("Scanning subdirectories:")
+        # Sized from the quota left after the root listing
+        api_semaphore = asyncio.Semaphore(api_concurrency())
+
+        async def list_subdir(url: str) -> List[dict]:
+            async with api_semaphore:
+                return await paginated_get(client, url)
+
+        tasks = [list_subdir(subdir["url"]) for subdir in subdirectories]
+        responses = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for i, files in enumerate(responses):
+            subdir_name = subdirectories[i]["name"]
+            print(f"Processing '{subdir_name}'...", end=" ")
+
+            if isinstance(files, httpx.HTTPStatusError):
+                print(f"Status {files.response.status_code}")
+                continue
+            if isinstance(files, Exception):
+                print(f"Failed: {files}")
+                continue
+
+            cho_files = [f for f in files
+                       if f.get("type") == "file" and f.get("name", "").endswith(".cho")]
+            all_cho_files.extend(cho_files)
+            print(f"{len(cho_files)} .cho files")
+
+    # Download from raw directly, same as the tree listing
+    for item in all_cho_files:
+        if item.get("path"):
+            item["download_url"] = raw_url(item["path"])
+    return all_cho_files
+
+async def fetch_song_list_from_github(client: httpx.AsyncClient,
+                                      etag: Optional[str] = None) -> Tuple[Optional[List[dict]], Optional[str]]:
+    """Fetch complete list of .cho files from GitHub repository.
+
+    Returns (files, etag). files is None when the listing is unchanged
+    since `etag` and an empty list when the fetch failed.
+    """
+    print_phase_header("GITHUB REPOSITORY SCAN")
+    print(f"GitHub tree URL: {GITHUB_TREE_URL}")
+
+    if GITHUB_TOKEN:
         print("Using GitHub token for authentication")
     else:
         print("No GitHub token - using anonymous access (rate limited)")
 
-    all_cho_files: List[dict] = []
-    
     try:
-        print("Establishing connection to GitHub API...")
-        async with httpx.AsyncClient(headers=headers, timeout=30.0) as client:
-            print("Fetching root directory contents...")
-            root_response = await client.get(GITHUB_API_URL)
-            root_response.raise_for_status()
-            root_contents = root_response.json()
-            print(f"Root directory fetched ({len(root_contents)} items)")
-
-            # Process root directory files
-            root_cho = [item for item in root_contents 
-                       if item.get("type") == "file" and item.get("name", "").endswith(".cho")]
-            all_cho_files.extend(root_cho)
-            print(f"Found {len(root_cho)} .cho files in root directory")
-
-            # Process subdirectories
-            subdirectories = [item for item in root_contents if item.get("type") == "dir"]
-            print(f"Found {len(subdirectories)} subdirectories to scan...")
-
-            if subdirectories:
-                print_section_header("Scanning subdirectories:")
-                tasks = [client.get(subdir["url"]) for subdir in subdirectories]
-                responses = await asyncio.gather(*tasks, return_exceptions=True)
-
-                for i, subdir_response in enumerate(responses):
-                    subdir_name = subdirectories[i]["name"]
-                    print(f"Processing '{subdir_name}'...", end=" ")
-                    
-                    if isinstance(subdir_response, Exception):
-                        print(f"Failed: {subdir_response}")
-                        continue
-                    
-                    if subdir_response.status_code == 200:
-                        files = subdir_response.json()
-                        cho_files = [f for f in files 
-                                   if f.get("type") == "file" and f.get("name", "").endswith(".cho")]
-                        all_cho_files.extend(cho_files)
-                        print(f"{len(cho_files)} .cho files")
-                    else:
-                        print(f"Status {subdir_response.status_code}")
+        # One request for the whole repository; the per-directory walk
+        # is only needed when GitHub truncates very large trees
+        all_cho_files, new_etag = await fetch_tree(client, etag)
+        if all_cho_files is None:
+            all_cho_files = await walk_contents(client)
 
         all_cho_files.sort(key=lambda f: f.get("name", ""))
         print(f"\nTotal: {len(all_cho_files)} .cho files found across all directories")
-        return all_cho_files
+        return all_cho_files, new_etag
 
+    except ListingNotModified:
+        print("Repository tree unchanged since last sync (304 Not Modified)")
+        return None, etag
     except httpx.RequestError as e:
         print(f"HTTP Error: Failed to fetch data from GitHub. {e}")
-        return []
+        return [], None
     except Exception as e:
         print(f"Unexpected Error: {e}")
-        return []
+        return [], None
+
+async def stream_to_file(session: httpx.AsyncClient, url: str, path: str) -> int:
+    """Stream one GET into `path`; returns the byte count"""
+    async with session.stream("GET", url, timeout=30.0) as resp:
+        delay = retry_delay(resp)
+        if delay is not None:
+            raise RateLimited(delay)
+        resp.raise_for_status()
+
+        # Chunks go straight to disk; disk writes run in a thread so
+        # other downloads keep moving
+        content_length = 0
+        f = await asyncio.to_thread(open, path, "wb")
+        try:
+            async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                await asyncio.to_thread(f.write, chunk)
+                content_length += len(chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+    return content_length
+
+def remove_partial(path: str) -> None:
+    """Delete a half-written download, if any"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
 
-async def download_song(session: httpx.AsyncClient, file_info: dict, target_name: str, 
-                       target_dir: str, semaphore: asyncio.Semaphore) -> Tuple[str, Optional[str]]:
-    """Download a single song file from GitHub"""
+async def download_song(session: httpx.AsyncClient, file_info: dict, target_name: str,
+                       target_dir: str, semaphore: asyncio.Semaphore,
+                       on_disk: set, log_lines: List[str]) -> Tuple[str, Optional[str]]:
+    """Download a single song file from GitHub.
+
+    `on_disk` is the caller's snapshot of songs_dir; finished downloads are
+    added to it. One status line per file is appended to `log_lines` for the
+    caller to print once all downloads are done.
+    """
     async with semaphore:
         orig_name = file_info["name"]
         local_path = os.path.join(target_dir, target_name)
 
-        if os.path.exists(local_path):
-            print(f"Skipping '{orig_name}' (already exists)")
+        if target_name in on_disk:
+            log_lines.append(f"Skipping '{orig_name}' (already exists)")
             return orig_name, None
 
         if target_name != orig_name:
-            print(f"Downloading '{orig_name}' -> '{target_name}'...", end=" ")
+            line = [f"Downloading '{orig_name}' -> '{target_name}'..."]
         else:
-            print(f"Downloading '{orig_name}'...", end=" ")
-        
+            line = [f"Downloading '{orig_name}'..."]
+
+        # Stream into a .part file and rename at the end, so an interrupted
+        # download never looks like a finished song
+        part_path = local_path + ".part"
         try:
-            resp = await session.get(file_info["download_url"], timeout=30.0)
-            resp.raise_for_status()
-            
-            # Show file size
-            content_length = len(resp.content)
+            # Throttled downloads wait and retry rather than being dropped
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                try:
+                    content_length = await stream_to_file(session, file_info["download_url"], part_path)
+                    break
+                except RateLimited as e:
+                    if attempt == RATE_LIMIT_RETRIES:
+                        raise
+                    line.append(f"(rate limited, retried after {e.delay:.0f}s)")
+                    await asyncio.sleep(e.delay)
+
+            await asyncio.to_thread(os.replace, part_path, local_path)
+            on_disk.add(target_name)
             size_kb = content_length / 1024
-            
-            with open(local_path, "wb") as f:
-                f.write(resp.content)
-            
-            print(f"({size_kb:.1f} KB)")
+            line.append(f"({size_kb:.1f} KB)")
+            log_lines.append(" ".join(line))
             return orig_name, target_name
-            
+
         except httpx.TimeoutException:
-            print(f"Timeout")
-            return orig_name, None
+            line.append("Timeout")
         except httpx.RequestError as e:
-            print(f"Error: {e}")
-            return orig_name, None
+            line.append(f"Error: {e}")
         except Exception as e:
-            print(f"Unexpected error: {e}")
-            return orig_name, None
+            line.append(f"Unexpected error: {e}")
+        log_lines.append(" ".join(line))
+        remove_partial(part_path)
+        return orig_name, None
 
 # ============================================================================
 # FILE SYNCHRONIZATION
 # ============================================================================
 
+def scan_local_songs(songs_dir: str) -> set:
+    """Names of .cho files in songs_dir, from a single directory pass"""
+    # scandir reports the file type with each entry, so no stat per file
+    with os.scandir(songs_dir) as entries:
+        return {
+            entry.name for entry in entries
+            if entry.name.lower().endswith(".cho") and entry.is_file()
+        }
+
+def plan_downloads(github_files: List[dict],
+                   on_disk: Set[str]) -> Tuple[List[Tuple[dict, str]], Set[str], int]:
+    """Pick the local name of every GitHub file in one pass.
+
+    Names are made unique among the GitHub files only, so a song keeps the
+    name it was stored under on earlier syncs. Returns (downloads,
+    github_local_names, renamed): the (file_info, target_name) pairs missing
+    from disk (registered or not), every local name the listing maps to, and
+    how many names had to change.
+    """
+    downloads: List[Tuple[dict, str]] = []
+    github_local_names: Set[str] = set()
+    renamed = 0
+    for fi in github_files:
+        orig = fi["name"]
+        target = unique_target_name(orig, github_local_names)
+        github_local_names.add(target)
+        if target != orig:
+            renamed += 1
+        if target not in on_disk:
+            downloads.append((fi, target))
+    return downloads, github_local_names, renamed
+
+def reconcile_local_files(paths: Dict[str, str], metadata: Dict[str, str],
+                          on_disk: Optional[set] = None) -> None:
+    """Register .cho files that are on disk but missing from metadata"""
+    print_phase_header("RECONCILIATION PHASE")
+
+    if on_disk is None:
+        try:
+            on_disk = scan_local_songs(paths['songs_dir'])
+        except FileNotFoundError:
+            on_disk = set()
+
+    meta_files = set(metadata.values())
+    missing_in_meta = sorted(on_disk - meta_files)
+    
+    if missing_in_meta:
+        print(f"🔧 Reconciling {len(missing_in_meta)} existing file(s) into metadata...")
+        from scripts.setup.shared_utils import get_next_song_id
+        next_id = get_next_song_id(metadata)
+        
+        for safe_name in missing_in_meta:
+            song_id = str(next_id)
+            # Ensure ID is normalized (remove leading zeros)
+            from scripts.setup.shared_utils import normalize_song_id
+            normalized_id = normalize_song_id(song_id)
+            metadata[normalized_id] = safe_name
+            print(f"Registered existing '{safe_name}' with ID {normalized_id}")
+            next_id += 1
+        
+        print(f"Saving updated metadata...")
+        save_metadata(metadata, paths['metadata_path'])
+    else:
+        print("All local files are already in metadata")
+
 async def sync_github_files(paths: Dict[str, str]) -> Dict[str, str]:
     """Synchronize .cho files from GitHub to local directory"""
     print_phase_header(" GITHUB FILE SYNCHRONIZATION")
-    
-    # Fetch GitHub file list
-    github_files = await fetch_song_list_from_github()
+
+    # The listing and the downloads share connections (HTTP/2 when h2 is
+    # installed), so TLS is set up once per host for the whole sync
+    async with make_client() as client:
+        return await sync_with_client(client, paths)
+
+async def sync_with_client(client: httpx.AsyncClient, paths: Dict[str, str]) -> Dict[str, str]:
+    """sync_github_files body, using an already open client"""
+    # Fetch GitHub file list, conditional on the ETag of the last full sync
+    stored_etag = read_metadata(paths['github_etag_path']).get("etag")
+    github_files, listing_etag = await fetch_song_list_from_github(client, stored_etag)
+    if github_files is None:
+        # Upstream is unchanged, but the local tree may not be: only skip the
+        # sync if every registered song is still on disk
+        metadata = read_metadata(paths['metadata_path'])
+        try:
+            on_disk = scan_local_songs(paths['songs_dir'])
+        except FileNotFoundError:
+            on_disk = set()
+        missing = set(metadata.values()) - on_disk
+        if metadata and not missing:
+            # Nothing to download or prune; only pick up local additions
+            reconcile_local_files(paths, metadata, on_disk)
+            print(f"\nSYNC COMPLETE - {len(metadata)} songs ready")
+            return metadata
+        print(f"{len(missing)} registered song file(s) missing locally; fetching the full listing")
+        github_files, listing_etag = await fetch_song_list_from_github(client)
     if not github_files:
         print("No files found on GitHub or failed to fetch. Aborting sync.")
         return read_metadata(paths['metadata_path'])
@@ -160,17 +480,15 @@ async def sync_github_files(paths: Dict[str, str]) -> Dict[str, str]:
     # Load existing metadata
     print_section_header("Loading existing metadata")
     metadata = read_metadata(paths['metadata_path'])
-    existing_filenames = set(metadata.values())
     filename_to_id = {v: k for k, v in metadata.items()}
     print(f"Found {len(metadata)} existing songs in metadata")
 
     # Scan local directory
     print_section_header("Scanning local songs directory")
+    # One snapshot serves the download checks and reconciliation; downloads
+    # add to it as files land
     try:
-        on_disk_now = set(
-            fn for fn in os.listdir(paths['songs_dir'])
-            if fn.lower().endswith(".cho") and os.path.isfile(os.path.join(paths['songs_dir'], fn))
-        )
+        on_disk_now = scan_local_songs(paths['songs_dir'])
         print(f"Found {len(on_disk_now)} .cho files on disk")
     except FileNotFoundError:
         on_disk_now = set()
@@ -178,18 +496,8 @@ async def sync_github_files(paths: Dict[str, str]) -> Dict[str, str]:
 
     # Generate safe filenames
     print_section_header("Generating safe filenames")
-    used_names = set(existing_filenames) | set(on_disk_now)
-    target_name_map: Dict[str, str] = {}
-    conflicts = 0
-    
-    for fi in github_files:
-        orig = fi["name"]
-        target = unique_target_name(orig, used_names)
-        target_name_map[orig] = target
-        used_names.add(target)
-        if target != orig:
-            conflicts += 1
-    
+    downloads, github_local_names, conflicts = plan_downloads(github_files, on_disk_now)
+
     if conflicts > 0:
         print(f"{conflicts} files needed name sanitization")
     else:
@@ -198,89 +506,60 @@ async def sync_github_files(paths: Dict[str, str]) -> Dict[str, str]:
     # Download new files
     print_phase_header("Downloading files")
     
-    semaphore = asyncio.Semaphore(10)
-    headers = {"Accept": "application/vnd.github+json"}
-    if GITHUB_TOKEN:
-        headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
-
-    async with httpx.AsyncClient(headers=headers) as client:
-        # Determine which files need downloading
-        tasks = []
-        for fi in github_files:
-            target = target_name_map[fi["name"]]
-            if target in existing_filenames:
-                continue
-            local_path = os.path.join(paths['songs_dir'], target)
-            if os.path.exists(local_path):
-                continue
-            tasks.append(download_song(client, fi, target, paths['songs_dir'], semaphore))
-
-        if not tasks:
-            print("All songs are up to date. No downloads needed.")
-        else:
-            print(f"Starting download of {len(tasks)} new songs...")
-            results = await asyncio.gather(*tasks)
-            newly_downloaded = [res for res in results if res and res[1] is not None]
-
-            if newly_downloaded:
-                print_section_header(f"Registering {len(newly_downloaded)} new songs in metadata")
-                
-                # Get next available ID
-                from scripts.setup.shared_utils import get_next_song_id
-                next_id = get_next_song_id(metadata)
-
-                for _, safe_name in newly_downloaded:
-                    song_id = str(next_id)
-                    # Ensure ID is normalized (remove leading zeros)
-                    from scripts.setup.shared_utils import normalize_song_id
-                    normalized_id = normalize_song_id(song_id)
-                    metadata[normalized_id] = safe_name
-                    print(f"Registered '{safe_name}' with ID {normalized_id}")
-                    next_id += 1
-                
-                print(f"Saving metadata...")
-                if save_metadata(metadata, paths['metadata_path']):
-                    print(f"Metadata saved")
-                else:
-                    print(f"Failed to save metadata")
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+    # Files come from raw.githubusercontent.com, which is not metered like
+    # the REST API, so no token is sent and downloads leave the quota alone
+    download_failures = 0
+    # Per-file results are collected and printed in one write after gather,
+    # so concurrent downloads don't contend on stdout
+    log_lines: List[str] = []
+    tasks = [
+        download_song(client, fi, target, paths['songs_dir'], semaphore, on_disk_now, log_lines)
+        for fi, target in downloads
+    ]
+
+    if not tasks:
+        print("All songs are up to date. No downloads needed.")
+    else:
+        print(f"Starting download of {len(tasks)} new songs...")
+        results = await asyncio.gather(*tasks)
+        print("\n".join(log_lines))
+        downloaded = [res for res in results if res and res[1] is not None]
+        download_failures = len(tasks) - len(downloaded)
+        # Files restored under a name that is already registered keep their ID
+        newly_downloaded = [res for res in downloaded if res[1] not in filename_to_id]
+        restored = len(downloaded) - len(newly_downloaded)
+        if restored:
+            print(f"Restored {restored} missing file(s) for songs already in metadata")
+
+        if newly_downloaded:
+            print_section_header(f"Registering {len(newly_downloaded)} new songs in metadata")
+
+            # Get next available ID
+            from scripts.setup.shared_utils import get_next_song_id
+            next_id = get_next_song_id(metadata)
+
+            for _, safe_name in newly_downloaded:
+                song_id = str(next_id)
+                # Ensure ID is normalized (remove leading zeros)
+                from scripts.setup.shared_utils import normalize_song_id
+                normalized_id = normalize_song_id(song_id)
+                metadata[normalized_id] = safe_name
+                print(f"Registered '{safe_name}' with ID {normalized_id}")
+                next_id += 1
+
+            print(f"Saving metadata...")
+            if save_metadata(metadata, paths['metadata_path']):
+                print(f"Metadata saved")
             else:
-                print("No new files were ultimately downloaded")
-
-    # Reconcile existing files
-    print_phase_header("RECONCILIATION PHASE")
-    
-    try:
-        on_disk = {
-            fn for fn in os.listdir(paths['songs_dir'])
-            if fn.lower().endswith(".cho") and os.path.isfile(os.path.join(paths['songs_dir'], fn))
-        }
-    except FileNotFoundError:
-        on_disk = set()
+                print(f"Failed to save metadata")
+        elif not restored:
+            print("No new files were ultimately downloaded")
 
-    meta_files = set(metadata.values())
-    missing_in_meta = sorted(on_disk - meta_files)
-    
-    if missing_in_meta:
-        print(f"🔧 Reconciling {len(missing_in_meta)} existing file(s) into metadata...")
-        from scripts.setup.shared_utils import get_next_song_id
-        next_id = get_next_song_id(metadata)
-        
-        for safe_name in missing_in_meta:
-            song_id = str(next_id)
-            # Ensure ID is normalized (remove leading zeros)
-            from scripts.setup.shared_utils import normalize_song_id
-            normalized_id = normalize_song_id(song_id)
-            metadata[normalized_id] = safe_name
-            print(f"Registered existing '{safe_name}' with ID {normalized_id}")
-            next_id += 1
-        
-        print(f"Saving updated metadata...")
-        save_metadata(metadata, paths['metadata_path'])
-    else:
-        print("All local files are already in metadata")
+    reconcile_local_files(paths, metadata, on_disk_now)
 
     # Clean up orphaned files
-    github_local_names = {target_name_map[f["name"]] for f in github_files}
     orphaned_files = set(filename_to_id.keys()) - github_local_names
     
     if orphaned_files:
@@ -304,6 +583,11 @@ async def sync_github_files(paths: Dict[str, str]) -> Dict[str, str]:
     else:
         print(" No orphaned files to prune")
 
+    # Only remember the listing once every file in it is on disk, so a run
+    # with failed downloads is retried in full next time
+    if listing_etag and not download_failures:
+        save_metadata({"etag": listing_etag}, paths['github_etag_path'])
+
     print(f"\nSYNC COMPLETE - {len(metadata)} songs ready")
     return metadata
 
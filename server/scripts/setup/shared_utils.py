@@ -67,7 +67,9 @@ def get_data_paths() -> Dict[str, str]:
         'songs_pdf_dir': str((data_dir / "songs_pdf").absolute()),
         'songs_img_dir': str((data_dir / "songs_img").absolute()),
         'metadata_path': str((data_dir / "songs_metadata.json").absolute()),
-        'gzip_list_path': str((data_dir / "songs_list.json.gz").absolute())
+        'gzip_list_path': str((data_dir / "songs_list.json.gz").absolute()),
+        'chordpro_meta_cache_path': str((data_dir / "chordpro_meta_cache.json").absolute()),
+        'github_etag_path': str((data_dir / "github_tree_etag.json").absolute())
     }
     
     return paths
@@ -270,6 +272,22 @@ def parse_chordpro_metadata(cho_path: str, default_title: str) -> Dict[str, Opti
     
     return data
 
+def parse_chordpro_metadata_cached(cho_path: str, default_title: str, cache: Dict[str, dict]) -> Dict[str, Optional[str]]:
+    """parse_chordpro_metadata() memoized in `cache` by file mtime and size"""
+    try:
+        st = os.stat(cho_path)
+    except OSError:
+        return parse_chordpro_metadata(cho_path, default_title)
+    # A list so the stamp compares equal after a JSON round-trip
+    stamp = [st.st_mtime_ns, st.st_size]
+    name = os.path.basename(cho_path)
+    hit = cache.get(name)
+    if hit and hit.get("stamp") == stamp:
+        return dict(hit["md"])
+    md = parse_chordpro_metadata(cho_path, default_title)
+    cache[name] = {"stamp": stamp, "md": md}
+    return md
+
 # ============================================================================
 # PROGRESS TRACKING
 # ============================================================================
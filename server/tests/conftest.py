@@ -53,8 +53,7 @@ def prepared_env(tmp_path_factory):
     firebase_admin.initialize_app = lambda *a, **kw: None  # type: ignore
 
     # Now import database module and patch its engine/session to sqlite for tests
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
     from sqlmodel import SQLModel
 
     from scripts.runtime import database as db
@@ -71,7 +70,7 @@ def prepared_env(tmp_path_factory):
 
     # Patch engine and session factory
     db.engine = test_engine
-    db.AsyncSessionLocal = sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False, autocommit=False)
+    db.AsyncSessionLocal = async_sessionmaker(bind=test_engine, expire_on_commit=False, autoflush=False)
 
     # Rebind the create tables function to use the patched engine
     async def _create_all():
@@ -0,0 +1,216 @@
+import asyncio
+from contextlib import contextmanager
+
+from sqlalchemy import event, select
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SQL statements executed on `engine` while the block runs."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+
+def test_song_loader_coalesces_concurrent_lookups(prepared_env, monkeypatch):
+    from scripts.runtime import database as db
+
+    async def _add_second_song():
+        async with db.AsyncSessionLocal() as session:
+            session.add(db.Song(id="902", title="Loader Song", artist="Test Artist", page_count=2, filename="902.pdf"))
+            await session.commit()
+
+    async def _remove_second_song():
+        async with db.AsyncSessionLocal() as session:
+            await session.delete(await session.get(db.Song, "902"))
+            await session.commit()
+
+    async def _lookup_both():
+        async with db.AsyncSessionLocal() as s1, db.AsyncSessionLocal() as s2:
+            return await asyncio.gather(db._load_song(s1, "1"), db._load_song(s2, "902"))
+
+    asyncio.run(_add_second_song())
+    monkeypatch.setattr(db, "SONG_LOADER_ENABLED", True)
+    monkeypatch.setattr(db, "song_loader", db.SongLoader(window_ms=5))
+    db.invalidate_song_cache()
+    try:
+        with count_queries(db.engine) as statements:
+            first, second = asyncio.run(_lookup_both())
+    finally:
+        db.invalidate_song_cache()
+        asyncio.run(_remove_second_song())
+
+    song_selects = [s for s in statements if "FROM songs" in s]
+    assert len(song_selects) == 1, statements
+    assert first is not None and first.id == "1"
+    assert second is not None and second.id == "902"
+    assert second.title == "Loader Song"
+
+
+
+def test_bounded_session_limits_get_scalar_and_stream(prepared_env, monkeypatch):
+    from sqlalchemy import select
+    from scripts.runtime import database as db
+
+    class _CountingSlot:
+        acquired = 0
+
+        async def __aenter__(self):
+            _CountingSlot.acquired += 1
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(db, "_query_semaphore", _CountingSlot())
+
+    async def _run():
+        async with db.BoundedAsyncSession(bind=db.engine) as session:
+            assert (await session.get(db.Song, "1")) is not None
+            assert (await session.scalar(select(db.Song.title).where(db.Song.id == "1")))
+            assert (await session.scalars(select(db.Song.id))).all()
+            result = await session.stream(select(db.Song.id))
+            assert [row async for row in result]
+
+    asyncio.run(_run())
+    # get, scalar, scalars (via execute) and stream each take one slot
+    assert _CountingSlot.acquired == 4
+
+
+def test_probe_db_timeout_covers_connect(prepared_env, monkeypatch):
+    from scripts.runtime import database as db
+
+    class _HangingConnect:
+        async def __aenter__(self):
+            await asyncio.sleep(10)
+
+        async def __aexit__(self, *exc):
+            return False
+
+    class _StalledEngine:
+        def connect(self):
+            return _HangingConnect()
+
+    # Keep the failed probe out of the shared health state
+    monkeypatch.setattr(db, "_HEALTH_STATE", dict(db._HEALTH_STATE))
+    ok, _, _ = asyncio.run(db._probe_db(1.0))
+    assert ok
+
+    monkeypatch.setattr(db, "engine", _StalledEngine())
+    ok, _, dur_ms = asyncio.run(db._probe_db(0.05))
+    assert not ok
+    assert dur_ms < 5000
+
+
+def _coalesce_participants(monkeypatch, db, window_ms=20):
+    monkeypatch.setattr(db, "PARTICIPANT_COALESCE_WINDOW_MS", window_ms)
+    # A fresh queue and flush task bound to this test's event loop
+    monkeypatch.setattr(db, "_participant_queue", None)
+    monkeypatch.setattr(db, "_participant_task", None)
+
+
+def _participants(db, room_id):
+    async def _run():
+        async with db.AsyncSessionLocal() as session:
+            res = await session.execute(
+                select(db.RoomParticipant.user_id).where(db.RoomParticipant.room_id == room_id)
+            )
+            return sorted(res.scalars().all())
+    return asyncio.run(_run())
+
+
+def test_concurrent_joins_coalesce_into_one_insert(prepared_env, monkeypatch):
+    from scripts.runtime import database as db
+
+    # conftest swaps add_participant for a SQLite version, so the coalescer
+    # is driven directly
+    _coalesce_participants(monkeypatch, db)
+    users = [f"coalesce-user-{i}" for i in range(5)]
+
+    async def _join_all():
+        return await asyncio.gather(*(db.submit_participant_op("add", "COALESCE1", u) for u in users))
+
+    with count_queries(db.engine) as statements:
+        results = asyncio.run(_join_all())
+
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO ROOMPARTICIPANT")]
+    assert len(inserts) == 1, statements
+    assert results == [None] * len(users)
+    assert _participants(db, "COALESCE1") == users
+
+    async def _leave_all():
+        await asyncio.gather(*(db.submit_participant_op("remove", "COALESCE1", u) for u in users))
+
+    asyncio.run(_leave_all())
+    assert _participants(db, "COALESCE1") == []
+
+
+def test_failed_participant_flush_fails_every_caller(prepared_env, monkeypatch):
+    from scripts.runtime import database as db
+
+    _coalesce_participants(monkeypatch, db)
+
+    class _BrokenSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, *args, **kwargs):
+            raise RuntimeError("connection lost")
+
+    real_factory = db.get_session_factory
+    monkeypatch.setattr(db, "get_session_factory", lambda: _BrokenSession)
+
+    async def _run():
+        failed = await asyncio.gather(
+            db.submit_participant_op("add", "COALESCE2", "a"),
+            db.submit_participant_op("remove", "COALESCE2", "b"),
+            return_exceptions=True,
+        )
+        # The flush loop survives a failed batch and serves the next one
+        monkeypatch.setattr(db, "get_session_factory", real_factory)
+        await db.submit_participant_op("add", "COALESCE2", "c")
+        return failed
+
+    failed = asyncio.run(_run())
+    assert [type(e) for e in failed] == [RuntimeError, RuntimeError]
+    assert all(str(e) == "connection lost" for e in failed)
+    assert _participants(db, "COALESCE2") == ["c"]
+
+
+def test_song_cache_keys_only_resolving_spellings(prepared_env, monkeypatch):
+    from scripts.runtime import database as db
+
+    async def _add_padded_song():
+        async with db.AsyncSessionLocal() as session:
+            session.add(db.Song(id="012", title="Padded", artist="Test Artist", page_count=1, filename="012.pdf"))
+            await session.commit()
+
+    async def _remove_padded_song():
+        async with db.AsyncSessionLocal() as session:
+            await session.delete(await session.get(db.Song, "012"))
+            await session.commit()
+
+    async def _lookup(song_id):
+        async with db.AsyncSessionLocal() as session:
+            return await db.get_song_by_id_from_db(session, song_id)
+
+    asyncio.run(_add_padded_song())
+    monkeypatch.setattr(db, "SONG_LOADER_ENABLED", False)
+    db.invalidate_song_cache()
+    try:
+        assert asyncio.run(_lookup("012")).id == "012"
+        assert set(db._song_cache) == {"012"}
+        # "12" resolves through its own candidates ("12", "0012"), not via "012"
+        assert asyncio.run(_lookup("12")) is None
+    finally:
+        db.invalidate_song_cache()
+        asyncio.run(_remove_padded_song())
@@ -0,0 +1,34 @@
+import logging
+from queue import Queue
+
+from scripts.runtime import logger as log
+
+
+def _record(msg):
+    return logging.LogRecord("test", logging.INFO, __file__, 0, msg, None, None)
+
+
+def test_full_log_queue_drops_oldest_and_counts():
+    queue = Queue(maxsize=2)
+    handler = log.DropOldestQueueHandler(queue)
+    dropped_before = log.get_log_queue_stats()["dropped"]
+
+    for i in range(5):
+        handler.enqueue(_record(f"m{i}"))
+
+    assert log.get_log_queue_stats()["dropped"] == dropped_before + 3
+    assert [queue.get_nowait().msg for _ in range(2)] == ["m3", "m4"]
+
+
+def test_listener_sentinel_fits_in_full_queue():
+    queue = Queue(maxsize=2)
+    handler = log.DropOldestQueueHandler(queue)
+    for i in range(2):
+        handler.enqueue(_record(f"m{i}"))
+    listener = log.DropOldestQueueListener(queue)
+
+    # The stock listener raises queue.Full here, so stop() never signals its thread
+    listener.enqueue_sentinel()
+
+    assert queue.get_nowait().msg == "m1"
+    assert queue.get_nowait() is listener._sentinel
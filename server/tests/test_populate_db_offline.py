@@ -0,0 +1,72 @@
+import asyncio
+
+from scripts.runtime.database import Song
+from scripts.setup import populate_db as pdb
+
+
+def _python_type(column):
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        # sqlmodel's AutoString does not declare one
+        return str
+
+
+def test_copy_records_follow_upsert_rows():
+    pending_rows = []
+    asyncio.run(pdb.upsert_song(
+        pending_rows, "7", title="Copy Song", artist="Someone", filename="7.cho",
+        page_count=3, key="G", tempo="90", genre="hymn", language="en",
+    ))
+    asyncio.run(pdb.upsert_song(pending_rows, "8", title="Sparse", artist=None, filename=None, page_count=1))
+
+    # COPY must supply exactly the columns upsert_song queues, in a fixed order
+    assert set(pdb.SONG_COPY_COLUMNS) == set(pending_rows[0])
+    assert len(pdb.SONG_COPY_COLUMNS) == len(pending_rows[0])
+
+    records = pdb.song_copy_records(pending_rows)
+    assert records[0] == ("7", "Copy Song", "Someone", "7.cho", 3, "G", "90", "hymn", "en")
+    assert records[1] == ("8", "Sparse", None, None, 1, None, None, None, None)
+
+    # Binary COPY rejects values of the wrong type for a column
+    columns = Song.__table__.columns
+    for record in records:
+        for name, value in zip(pdb.SONG_COPY_COLUMNS, record):
+            column = columns[name]
+            if value is None:
+                assert column.nullable, name
+            else:
+                assert isinstance(value, _python_type(column)), name
+
+
+def test_webp_pool_created_once_under_concurrent_callers(monkeypatch):
+    import threading
+
+    created = []
+
+    class _FakePool:
+        def __init__(self, max_workers):
+            created.append(self)
+
+        def shutdown(self):
+            pass
+
+    monkeypatch.setattr(pdb, "ProcessPoolExecutor", _FakePool)
+    monkeypatch.setattr(pdb, "WEBP_WORKERS", 4)
+    monkeypatch.setattr(pdb, "_webp_pool", None)
+
+    start = threading.Barrier(8)
+    seen = []
+
+    def _grab():
+        start.wait()
+        seen.append(pdb._get_webp_pool())
+
+    threads = [threading.Thread(target=_grab) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(created) == 1
+    assert all(pool is created[0] for pool in seen)
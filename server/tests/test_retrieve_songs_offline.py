@@ -0,0 +1,161 @@
+import asyncio
+import json
+import os
+import shutil
+
+import httpx
+import pytest
+
+from scripts.setup import retrieve_songs as rs
+
+
+TREE = {
+    "truncated": False,
+    "tree": [
+        {"path": "hymns/Amazing Grace.cho", "type": "blob"},
+        {"path": "carols/Silent Night.cho", "type": "blob"},
+        {"path": "README.md", "type": "blob"},
+    ],
+}
+TREE_ETAG = '"tree-v1"'
+
+
+class FakeGitHub:
+    """MockTransport handler serving the tree listing and raw files."""
+
+    def __init__(self, failing_paths=()):
+        self.failing_paths = set(failing_paths)
+        self.tree_requests = []
+        self.raw_requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == "api.github.com":
+            self.tree_requests.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == TREE_ETAG:
+                return httpx.Response(304)
+            return httpx.Response(200, json=TREE, headers={"ETag": TREE_ETAG})
+        path = request.url.path
+        self.raw_requests.append(path)
+        if any(path.endswith(p) for p in self.failing_paths):
+            return httpx.Response(500)
+        return httpx.Response(200, content=b"{title: test}\n")
+
+
+@pytest.fixture()
+def sync_paths(tmp_path):
+    songs_dir = tmp_path / "songs"
+    songs_dir.mkdir()
+    return {
+        "songs_dir": str(songs_dir),
+        "metadata_path": str(tmp_path / "songs_metadata.json"),
+        "github_etag_path": str(tmp_path / "github_tree_etag.json"),
+    }
+
+
+def run_sync(paths, github):
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(github)) as client:
+            return await rs.sync_with_client(client, paths)
+    return asyncio.run(_run())
+
+
+def stored_etag(paths):
+    if not os.path.exists(paths["github_etag_path"]):
+        return None
+    with open(paths["github_etag_path"], encoding="utf-8") as f:
+        return json.load(f).get("etag")
+
+
+def test_sync_saves_etag_only_when_all_downloads_succeed(sync_paths):
+    github = FakeGitHub(failing_paths={"Silent Night.cho"})
+    metadata = run_sync(sync_paths, github)
+    assert sorted(metadata.values()) == ["Amazing Grace.cho"]
+    assert stored_etag(sync_paths) is None
+
+    # The next run is unconditional and retries the failed file
+    github = FakeGitHub()
+    metadata = run_sync(sync_paths, github)
+    assert github.tree_requests == [None]
+    assert sorted(metadata.values()) == ["Amazing Grace.cho", "Silent Night.cho"]
+    assert stored_etag(sync_paths) == TREE_ETAG
+
+
+def test_sync_not_modified_skips_downloads(sync_paths):
+    run_sync(sync_paths, FakeGitHub())
+    ids_before = json.load(open(sync_paths["metadata_path"], encoding="utf-8"))
+
+    github = FakeGitHub()
+    metadata = run_sync(sync_paths, github)
+    assert github.tree_requests == [TREE_ETAG]
+    assert github.raw_requests == []
+    assert metadata == ids_before
+
+
+def test_sync_not_modified_refetches_when_files_are_missing(sync_paths):
+    run_sync(sync_paths, FakeGitHub())
+    ids_before = json.load(open(sync_paths["metadata_path"], encoding="utf-8"))
+
+    # Songs directory wiped while metadata and the stored ETag were kept
+    shutil.rmtree(sync_paths["songs_dir"])
+    os.makedirs(sync_paths["songs_dir"])
+
+    github = FakeGitHub()
+    metadata = run_sync(sync_paths, github)
+    assert github.tree_requests == [TREE_ETAG, None]
+    assert len(github.raw_requests) == 2
+    assert sorted(os.listdir(sync_paths["songs_dir"])) == ["Amazing Grace.cho", "Silent Night.cho"]
+    # Restored files keep their song IDs
+    assert metadata == ids_before
+
+
+def _listing(*paths):
+    return [{"name": p.rsplit("/", 1)[-1], "path": p, "type": "file", "download_url": rs.raw_url(p)} for p in paths]
+
+
+def test_plan_downloads_same_basename_in_different_directories():
+    files = _listing("hymns/Song.cho", "carols/Song.cho", "Other.cho")
+    downloads, local_names, renamed = rs.plan_downloads(files, set())
+
+    targets = [target for _, target in downloads]
+    assert len(targets) == 3 and len(set(targets)) == 3
+    assert targets[0] == "Song.cho"
+    assert targets[1] != "Song.cho" and targets[1].endswith(".cho")
+    assert local_names == set(targets)
+    assert renamed == 1
+
+
+def test_plan_downloads_replanning_synced_names_downloads_nothing():
+    files = _listing("hymns/Song.cho", "carols/Song.cho", "Bad:Name.cho")
+    first, first_names, _ = rs.plan_downloads(files, set())
+
+    # A synced file's own name must not count as taken on the next run
+    again, again_names, _ = rs.plan_downloads(files, set(first_names))
+    assert again == []
+    assert again_names == first_names
+
+
+def test_contents_walk_lists_the_configured_branch(monkeypatch):
+    monkeypatch.setattr(rs, "GITHUB_BRANCH", "songbook-v2")
+    listed = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        listed.append(request.url)
+        if request.url.path.endswith("/contents/"):
+            return httpx.Response(200, json=[
+                {"name": "hymns", "type": "dir",
+                 "url": "https://api.github.com/repos/o/r/contents/hymns?ref=songbook-v2"},
+            ])
+        return httpx.Response(200, json=[
+            {"name": "Song.cho", "path": "hymns/Song.cho", "type": "file"},
+        ])
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await rs.walk_contents(client)
+
+    files = asyncio.run(_run())
+    assert [f["path"] for f in files] == ["hymns/Song.cho"]
+    assert len(listed) == 2
+    for url in listed:
+        assert url.params["ref"] == "songbook-v2"
+        assert url.params["per_page"] == str(rs.GITHUB_PER_PAGE)
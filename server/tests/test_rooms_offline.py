@@ -65,6 +65,12 @@ def test_rooms_end_to_end_flow(client):
     r = client.post(f"/rooms/{room_id}/page", json={"page": 1})
     assert r.status_code == 200, r.text
 
+    # Room details reflect the new song (cached room state was invalidated)
+    r = client.get(f"/rooms/{room_id}")
+    assert r.status_code == 200, r.text
+    assert r.json()["current_song"] == song_id
+    assert r.json()["current_page"] == 1
+
     # 6) Update to an out-of-range page (2) -> expect 400
     r = client.post(f"/rooms/{room_id}/page", json={"page": 2})
     assert r.status_code == 400
@@ -100,3 +106,34 @@ def test_rooms_end_to_end_flow(client):
     # 12) Room details should now be 404
     r = client.get(f"/rooms/{room_id}")
     assert r.status_code == 404
+
+
+def test_update_page_after_room_deleted_elsewhere(client, monkeypatch):
+    import asyncio
+    from scripts.runtime import database as db
+
+    r = client.post("/rooms/")
+    assert r.status_code == 200, r.text
+    room_id = r.json()["room_id"]
+
+    # Act as if the LISTEN connection were up so room reads fill the cache
+    monkeypatch.setattr(db, "_room_listener_conn", object())
+    try:
+        r = client.get(f"/rooms/{room_id}")
+        assert r.status_code == 200, r.text
+        assert room_id in db._room_cache
+
+        # Another worker deletes the room; this process never hears about it
+        async def _delete_elsewhere():
+            async with db.AsyncSessionLocal() as session:
+                await session.execute(db._DEL_ROOM, {"room_id": room_id})
+                await session.commit()
+
+        asyncio.run(_delete_elsewhere())
+
+        # The cached snapshot still passes the host check, but the write path
+        # re-reads the row and reports it gone instead of a StaleDataError 500
+        r = client.post(f"/rooms/{room_id}/page", json={"page": 1})
+        assert r.status_code == 404, r.text
+    finally:
+        db.invalidate_room(room_id)
@@ -0,0 +1,130 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from scripts.runtime import websocket_server as ws
+
+
+class RecordingProtocol(ws.MusicRoomProtocol):
+    """Protocol whose writer records frames instead of sending them."""
+
+    async def _send_bytes(self, payload: bytes):
+        self.frames.append(json.loads(payload))
+
+
+class FakeConnection:
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.frames = []
+
+    def sendMessage(self, payload):
+        self.frames.append(json.loads(payload))
+
+    def enqueue_bytes(self, encoded):
+        self.sendMessage(encoded)
+        return True
+
+
+def _writer_protocol(batch_after=2):
+    proto = RecordingProtocol()
+    proto.frames = []
+    proto.user_id = "writer-user"
+    proto.factory = SimpleNamespace(ws_batch_after_n_msgs=batch_after, ws_buffer_threshold_bytes=1 << 16)
+    proto._init_send_queue()
+    return proto
+
+
+def test_writer_batches_queued_messages_in_order():
+    async def _run():
+        proto = _writer_protocol(batch_after=2)
+        for i in range(3):
+            proto.enqueue_message({"type": "chat", "n": i})
+        # An envelope from the factory's periodic flush, queued mid-burst
+        proto.enqueue_bytes(ws._encode({"type": "batched_update", "data": {"messages": [
+            {"type": "chat", "n": 3}, {"type": "chat", "n": 4},
+        ]}}))
+        proto.enqueue_message({"type": "chat", "n": 5})
+        await asyncio.sleep(0.01)
+        proto._close_send_queue()
+        return proto.frames
+
+    frames = asyncio.run(_run())
+    # The first messages of the burst go out unbatched, the rest in one frame
+    assert frames[:2] == [{"type": "chat", "n": 0}, {"type": "chat", "n": 1}]
+    assert len(frames) == 3
+    batch = frames[2]
+    assert batch["type"] == "batched_update"
+    inner = batch["data"]["messages"]
+    assert [m["n"] for m in inner] == [2, 3, 4, 5]
+    assert all(m["type"] != "batched_update" for m in inner)
+
+
+def test_batch_encoded_matches_json_encoding():
+    payloads = [ws._encode({"type": "a", "v": 1}), ws._encode({"type": "b", "v": "é"})]
+    scratch = bytearray(4)
+    expected = ws._encode({"type": "batched_update", "data": {"messages": [
+        {"type": "a", "v": 1}, {"type": "b", "v": "é"},
+    ]}})
+    assert ws._batch_encoded(payloads, scratch) == expected
+    # Reusing the grown scratch buffer gives the same bytes
+    assert ws._batch_encoded(payloads, scratch) == expected
+
+
+def _factory_with_room(room_id, *user_ids):
+    factory = ws.MusicRoomFactory()
+    factory.ws_coalesce_window_s = 0.02
+    connections = [FakeConnection(u) for u in user_ids]
+    for conn in connections:
+        factory.connections[conn.user_id] = conn
+        factory.join_room(conn, room_id)
+    return factory, connections
+
+
+def test_page_updates_coalesce_to_latest_per_room():
+    async def _run():
+        factory, (alice, bob) = _factory_with_room("ROOM1", "alice", "bob")
+        carol = FakeConnection("carol")
+        factory.connections["carol"] = carol
+        factory.join_room(carol, "ROOM2")
+        try:
+            for page in range(1, 6):
+                await factory.broadcast_page_updated("ROOM1", {"current_page": page})
+            await factory.broadcast_page_updated("ROOM2", {"current_page": 9})
+            await asyncio.sleep(0.05)
+        finally:
+            factory._flush_task.cancel()
+        return alice.frames, bob.frames, carol.frames
+
+    alice, bob, carol = asyncio.run(_run())
+    # The first update opens the window; only the latest page follows it
+    expected = [
+        {"type": "page_updated", "data": {"current_page": 1}},
+        {"type": "page_updated", "data": {"current_page": 5}},
+    ]
+    assert alice == expected
+    assert bob == expected
+    # Another room's window is independent
+    assert carol == [{"type": "page_updated", "data": {"current_page": 9}}]
+
+
+def test_coalesced_song_and_page_updates_share_one_frame():
+    async def _run():
+        factory, (alice,) = _factory_with_room("ROOM3", "alice")
+        try:
+            await factory.broadcast_page_updated("ROOM3", {"current_page": 1})
+            await factory.broadcast_song_updated("ROOM3", {"song_id": "7", "title": "Old"})
+            await factory.broadcast_page_updated("ROOM3", {"current_page": 2})
+            await factory.broadcast_song_updated("ROOM3", {"song_id": "8", "title": "New"})
+            await asyncio.sleep(0.05)
+        finally:
+            factory._flush_task.cancel()
+        return alice.frames
+
+    frames = asyncio.run(_run())
+    assert len(frames) == 2
+    batch = frames[1]
+    assert batch["type"] == "batched_update"
+    inner = batch["data"]["messages"]
+    assert [m["type"] for m in inner] == ["page_updated", "song_updated"]
+    assert inner[0]["data"]["current_page"] == 2
+    assert inner[1]["data"]["song_id"] == "8"